@@ -16,12 +16,18 @@ SET search_path TO ai_wingman, public;
 
 -- Main table: Slack messages with vector embeddings
 -- ----------------------------------------------------------------------------
+-- Hash-partitioned by channel so each partition carries its own, smaller
+-- HNSW index and channel-filtered searches prune to a single partition.
+-- Unique constraints on a partitioned table must include the partition key,
+-- hence (id, channel_id) and (slack_message_id, channel_id); Slack message
+-- timestamps are only unique within a channel anyway.
 CREATE TABLE IF NOT EXISTS slack_messages (
-    -- Primary identifier
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    -- Primary identifier (the application supplies time-ordered UUIDv7s;
+    -- the default only covers rows inserted by hand)
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     
     -- Slack metadata
-    slack_message_id VARCHAR(100) NOT NULL UNIQUE,
+    slack_message_id VARCHAR(100) NOT NULL,
     channel_id VARCHAR(100) NOT NULL,
     channel_name VARCHAR(255),
     user_id VARCHAR(100) NOT NULL,
@@ -31,11 +37,12 @@ CREATE TABLE IF NOT EXISTS slack_messages (
     message_text TEXT NOT NULL,
     message_type VARCHAR(50) DEFAULT 'message',
     
-    -- Vector embedding for semantic search
-    embedding vector(384),  -- 384 dimensions for all-MiniLM-L6-v2
+    -- Vector embedding for semantic search (fp16 halfvec: half the storage
+    -- of vector(384) with negligible recall loss)
+    embedding halfvec(384),  -- 384 dimensions for all-MiniLM-L6-v2
     
     -- Timestamps
-    slack_timestamp DECIMAL(16, 6) NOT NULL,  -- Slack's timestamp format
+    slack_timestamp BIGINT NOT NULL,  -- Slack's timestamp, in microseconds
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
@@ -43,19 +50,39 @@ CREATE TABLE IF NOT EXISTS slack_messages (
     metadata JSONB DEFAULT '{}'::jsonb,
     
     -- Soft delete flag
-    is_deleted BOOLEAN DEFAULT FALSE
-);
+    is_deleted BOOLEAN DEFAULT FALSE,
+
+    -- Demo/sample data flag (see scripts/demo_database.py)
+    is_demo BOOLEAN DEFAULT FALSE,
+
+    PRIMARY KEY (id, channel_id),
+    CONSTRAINT uq_slack_messages_slack_message_id
+        UNIQUE (slack_message_id, channel_id)
+) PARTITION BY HASH (channel_id);
+
+-- 16 partitions; indexes created on slack_messages below are created on
+-- every partition automatically
+DO $$
+BEGIN
+    FOR i IN 0..15 LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS slack_messages_p%s '
+            'PARTITION OF slack_messages FOR VALUES WITH (MODULUS 16, REMAINDER %s)',
+            i, i
+        );
+    END LOOP;
+END $$;
 
 -- Performance indexes
 -- ----------------------------------------------------------------------------
--- Index for fast user lookups
-CREATE INDEX idx_slack_messages_user_id 
-    ON slack_messages(user_id) 
+-- Per-user and per-channel message lists (live rows, newest first); the
+-- index order matches get_messages_by_user/channel, so no Sort is needed
+CREATE INDEX idx_slack_messages_user_timestamp 
+    ON slack_messages(user_id, slack_timestamp DESC) 
     WHERE is_deleted = FALSE;
 
--- Index for channel-based queries
-CREATE INDEX idx_slack_messages_channel_id 
-    ON slack_messages(channel_id) 
+CREATE INDEX idx_slack_messages_channel_timestamp 
+    ON slack_messages(channel_id, slack_timestamp DESC) 
     WHERE is_deleted = FALSE;
 
 -- Index for time-based queries
@@ -63,18 +90,25 @@ CREATE INDEX idx_slack_messages_timestamp
     ON slack_messages(slack_timestamp DESC) 
     WHERE is_deleted = FALSE;
 
--- Vector similarity search index (HNSW algorithm)
+-- Vector similarity search index (HNSW algorithm, one graph per partition)
+-- m / ef_construction sized for up to ~1M vectors; see
+-- operations.configure_hnsw_params() for the query-time ef_search to pair
 CREATE INDEX idx_slack_messages_embedding 
     ON slack_messages 
-    USING hnsw (embedding vector_cosine_ops)
-    WITH (m = 16, ef_construction = 64);
+    USING hnsw (embedding halfvec_cosine_ops)
+    WITH (m = 24, ef_construction = 128);
 
 -- Alternative: IVFFlat index (faster build, slightly slower search)
 -- CREATE INDEX idx_slack_messages_embedding 
 --     ON slack_messages 
---     USING ivfflat (embedding vector_cosine_ops)
+--     USING ivfflat (embedding halfvec_cosine_ops)
 --     WITH (lists = 100);
 
+-- Index for demo data cleanup (only demo rows are indexed)
+CREATE INDEX idx_slack_messages_is_demo 
+    ON slack_messages(is_demo) 
+    WHERE is_demo;
+
 -- Metadata search index
 CREATE INDEX idx_slack_messages_metadata 
     ON slack_messages USING gin(metadata);
@@ -108,7 +142,7 @@ CREATE TABLE IF NOT EXISTS user_contexts (
 -- ----------------------------------------------------------------------------
 CREATE TABLE IF NOT EXISTS conversation_threads (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    thread_ts DECIMAL(16, 6) NOT NULL UNIQUE,  -- Slack thread timestamp
+    thread_ts BIGINT NOT NULL UNIQUE,  -- Slack thread timestamp, in microseconds
     channel_id VARCHAR(100) NOT NULL,
     
     -- Thread summary
@@ -147,7 +181,7 @@ CREATE TRIGGER trigger_user_contexts_updated_at
 -- Helper function: Vector similarity search with input validation
 -- ----------------------------------------------------------------------------
 CREATE OR REPLACE FUNCTION search_similar_messages(
-    query_embedding vector(384),
+    query_embedding halfvec(384),
     similarity_threshold FLOAT DEFAULT 0.7,
     result_limit INTEGER DEFAULT 5
 )
@@ -157,7 +191,7 @@ RETURNS TABLE (
     user_name VARCHAR,
     channel_name VARCHAR,
     similarity FLOAT,
-    slack_timestamp DECIMAL
+    slack_timestamp BIGINT
 ) AS $$
 BEGIN
     -- Input validation
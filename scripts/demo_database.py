@@ -7,22 +7,25 @@ Showcases creating messages, user contexts, and similarity search.
 """
 
 import asyncio
-import random
-from datetime import datetime
-from typing import List
-
+import time
+import numpy as np
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.progress import track
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ai_wingman.config import settings
 from ai_wingman.database import db_manager, operations
+from ai_wingman.database.models import SlackMessage
 from ai_wingman.utils import logger
 
 
 console = Console()
 
+# Read once; settings attributes go through pydantic on every access
+EMBEDDING_DIMENSION = settings.embedding_dimension
+
 
 # ============================================================================
 # Demo Data
@@ -88,10 +91,24 @@ SAMPLE_MESSAGES = [
 ]
 
 
-def generate_fake_embedding(seed: int) -> List[float]:
-    """Generate a fake 384-dimensional embedding for demo purposes."""
-    random.seed(seed)
-    return [random.uniform(-1, 1) for _ in range(settings.embedding_dimension)]
+def generate_fake_embeddings(count: int, seed: int = 0) -> np.ndarray:
+    """Generate a (count, 384) matrix of fake embeddings for demo purposes.
+
+    Drawn in a single vectorized call; row ``i`` is the embedding for
+    ``SAMPLE_MESSAGES[i]``. Values are float16 to match the halfvec column.
+    """
+    rng = np.random.default_rng(seed)
+    # Draw float32 directly (no float64 intermediate) and rescale
+    # [0, 1) -> [-1, 1) in place
+    embeddings = rng.random((count, EMBEDDING_DIMENSION), dtype=np.float32)
+    embeddings *= 2.0
+    embeddings -= 1.0
+    return embeddings.astype(np.float16)
+
+
+def truncate(text: str, width: int) -> str:
+    """Cut text to width characters, adding an ellipsis when shortened."""
+    return text if len(text) <= width else text[:width] + "..."
 
 
 # ============================================================================
@@ -130,164 +147,177 @@ async def demo_health_check():
     return True
 
 
-async def demo_create_messages():
+async def demo_create_messages(session: AsyncSession):
     """Demonstrate creating Slack messages."""
     console.print("[bold]2. Creating Sample Messages[/bold]")
 
-    async with db_manager.get_session() as session:
-        created_count = 0
-
-        for i, msg_data in enumerate(
-            track(SAMPLE_MESSAGES, description="Creating messages...")
-        ):
-            # Generate unique Slack message ID
-            slack_msg_id = f"msg_{datetime.now().timestamp()}_{i}"
-            slack_ts = datetime.now().timestamp() + i
-
-            # Create message with fake embedding
-            await operations.create_slack_message(
-                session,
-                slack_message_id=slack_msg_id,
-                channel_id=msg_data["channel_id"],
-                channel_name=msg_data["channel_name"],
-                user_id=msg_data["user_id"],
-                user_name=msg_data["user_name"],
-                message_text=msg_data["text"],
-                slack_timestamp=slack_ts,
-                embedding=generate_fake_embedding(i),
-                metadata={"demo": True, "index": i},
-            )
-            created_count += 1
+    # Build every row up front so the whole batch goes out in one INSERT
+    embeddings = generate_fake_embeddings(len(SAMPLE_MESSAGES))
+    base_ts = time.time()
+    rows = []
+    console.print(f" Creating {len(SAMPLE_MESSAGES)} messages...")
+    for i, msg_data in enumerate(SAMPLE_MESSAGES):
+        # Generate unique Slack message ID from one shared base timestamp
+        slack_msg_id = f"msg_{base_ts:.6f}_{i}"
+        slack_ts = base_ts + i
+
+        rows.append(
+            {
+                "slack_message_id": slack_msg_id,
+                "channel_id": msg_data["channel_id"],
+                "channel_name": msg_data["channel_name"],
+                "user_id": msg_data["user_id"],
+                "user_name": msg_data["user_name"],
+                "message_text": msg_data["text"],
+                "slack_timestamp": slack_ts,
+                "embedding": embeddings[i],
+                "metadata_": {"index": i},
+                "is_demo": True,
+            }
+        )
 
-        await session.commit()
-        console.print(f" Created {created_count} messages")
+    # executemany: one round-trip for the batch instead of one per message
+    await session.execute(insert(SlackMessage), rows)
+    await session.commit()
+    console.print(f" Created {len(rows)} messages")
 
     console.print()
 
 
+async def _in_session(operation, **kwargs):
+    """Run one operation in its own pooled session (for concurrent reads)."""
+    async with db_manager.get_session() as session:
+        return await operation(session, **kwargs)
+
+
 async def demo_query_messages():
     """Demonstrate querying messages."""
     console.print("[bold]3. Querying Messages[/bold]")
 
-    async with db_manager.get_session() as session:
+    # The three reads are independent, so issue them concurrently; each needs
+    # its own session since AsyncSession is not safe for concurrent use
+    alice_messages, general_messages, total_count = await asyncio.gather(
         # Get messages by user
-        alice_messages = await operations.get_messages_by_user(
-            session,
-            user_id="U001",
-        )
-        console.print(f" Alice has {len(alice_messages)} messages")
-
+        _in_session(operations.get_messages_by_user, user_id="U001"),
         # Get messages by channel
-        general_messages = await operations.get_messages_by_channel(
-            session,
-            channel_id="C001",
-        )
-        console.print(f" #general has {len(general_messages)} messages")
-
+        _in_session(operations.get_messages_by_channel, channel_id="C001"),
         # Get total count
-        total_count = await operations.get_message_count(session)
-        console.print(f" Total messages: {total_count}")
+        _in_session(operations.get_message_count),
+    )
+    console.print(f" Alice has {len(alice_messages)} messages")
+    console.print(f" #general has {len(general_messages)} messages")
+    console.print(f" Total messages: {total_count}")
 
     console.print()
 
 
-async def demo_display_messages():
+async def demo_display_messages(session: AsyncSession):
     """Display messages in a formatted table."""
     console.print("[bold]4. Recent Messages[/bold]")
 
-    async with db_manager.get_session() as session:
-        # Get all messages
-        all_messages = await operations.get_messages_by_channel(
-            session,
-            channel_id="C001",
-            limit=100,
-        )
-
-        # Create table
-        table = Table(show_header=True, header_style="bold cyan")
-        table.add_column("User", style="green")
-        table.add_column("Channel", style="yellow")
-        table.add_column("Message", style="white")
-        table.add_column("Has Embedding", style="magenta")
+    # Get all messages
+    all_messages = await operations.get_messages_by_channel(
+        session,
+        channel_id="C001",
+        limit=100,
+    )
 
-        for msg in all_messages[:5]:  # Show first 5
-            table.add_row(
-                msg.user_name or msg.user_id,
-                msg.channel_name or msg.channel_id,
-                msg.message_text[:50] + ("..." if len(msg.message_text) > 50 else ""),
-                "✅" if msg.embedding is not None else "❌",
-            )
+    # Create table
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("User", style="green")
+    table.add_column("Channel", style="yellow")
+    table.add_column("Message", style="white")
+    table.add_column("Has Embedding", style="magenta")
+
+    # Build display rows up front (first 5 messages)
+    rows = [
+        (
+            msg.user_name or msg.user_id,
+            msg.channel_name or msg.channel_id,
+            truncate(msg.message_text, 50),
+            "✅" if msg.has_embedding else "❌",
+        )
+        for msg in all_messages[:5]
+    ]
+    for row in rows:
+        table.add_row(*row)
 
-        console.print(table)
+    console.print(table)
 
     console.print()
 
 
-async def demo_user_contexts():
-    """Demonstrate user context operations."""
-    console.print("[bold]5. User Contexts[/bold]")
+async def _process_user(user_id: str, user_name: str) -> None:
+    """Create/refresh one user's context in its own session."""
+    async with db_manager.get_session() as user_session:
+        # Get or create context
+        await operations.get_or_create_user_context(
+            user_session,
+            user_id=user_id,
+            user_name=user_name,
+        )
 
-    async with db_manager.get_session() as session:
-        # Create user contexts
-        users = {
-            "U001": "Alice",
-            "U002": "Bob",
-            "U003": "Charlie",
-            "U004": "Diana",
-        }
-
-        for user_id, user_name in users.items():
-            # Get or create context
-            context = await operations.get_or_create_user_context(
-                session,
+        # Count user's messages
+        msg_count = await operations.get_message_count(user_session, user_id=user_id)
+
+        # Update context stats
+        if msg_count > 0:
+            await operations.update_user_context_stats(
+                user_session,
                 user_id=user_id,
-                user_name=user_name,
+                increment_messages=msg_count,
             )
 
-            # Count user's messages
-            msg_count = await operations.get_message_count(session, user_id=user_id)
 
-            # Update context stats
-            if msg_count > 0:
-                await operations.update_user_context_stats(
-                    session,
-                    user_id=user_id,
-                    increment_messages=msg_count,
-                )
+async def demo_user_contexts(session: AsyncSession):
+    """Demonstrate user context operations."""
+    console.print("[bold]5. User Contexts[/bold]")
 
-        await session.commit()
+    # Create user contexts
+    users = {
+        "U001": "Alice",
+        "U002": "Bob",
+        "U003": "Charlie",
+        "U004": "Diana",
+    }
+
+    # Users are independent, so process them concurrently. AsyncSession is
+    # not safe for concurrent use, so each user gets its own pooled session.
+    await asyncio.gather(
+        *(_process_user(user_id, user_name) for user_id, user_name in users.items())
+    )
 
-        # Display user contexts
-        table = Table(show_header=True, header_style="bold cyan")
-        table.add_column("User", style="green")
-        table.add_column("Total Messages", style="yellow")
-        table.add_column("First Message", style="white")
-        table.add_column("Last Message", style="white")
-
-        for user_id in users.keys():
-            context = await operations.get_user_context(session, user_id)
-            if context:
-                table.add_row(
-                    context.user_name or context.user_id,
-                    str(context.total_messages),
-                    (
-                        context.first_message_at.strftime("%H:%M:%S")
-                        if context.first_message_at
-                        else "N/A"
-                    ),
-                    (
-                        context.last_message_at.strftime("%H:%M:%S")
-                        if context.last_message_at
-                        else "N/A"
-                    ),
-                )
+    # Display user contexts
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("User", style="green")
+    table.add_column("Total Messages", style="yellow")
+    table.add_column("First Message", style="white")
+    table.add_column("Last Message", style="white")
 
-        console.print(table)
+    for user_id in users.keys():
+        context = await operations.get_user_context(session, user_id)
+        if context:
+            table.add_row(
+                context.user_name or context.user_id,
+                str(context.total_messages),
+                (
+                    context.first_message_at.strftime("%H:%M:%S")
+                    if context.first_message_at
+                    else "N/A"
+                ),
+                (
+                    context.last_message_at.strftime("%H:%M:%S")
+                    if context.last_message_at
+                    else "N/A"
+                ),
+            )
+
+    console.print(table)
 
     console.print()
 
 
-async def demo_similarity_search():
+async def demo_similarity_search(session: AsyncSession):
     """Demonstrate vector similarity search."""
     console.print("[bold]6. Similarity Search (Demo)[/bold]")
     console.print(
@@ -295,107 +325,104 @@ async def demo_similarity_search():
     )
     console.print()
 
-    async with db_manager.get_session() as session:
-        # Use a fake query embedding (similar to one of our messages)
-        query_embedding = generate_fake_embedding(1)  # Similar to Bob's first message
-
-        # Search for similar messages
-        similar = await operations.search_similar_messages(
-            session,
-            query_embedding=query_embedding,
-            similarity_threshold=0.0,  # Low threshold since embeddings are random
-            limit=3,
-        )
+    # Use a fake query embedding (similar to one of our messages)
+    # Same row as Bob's first message
+    query_embedding = generate_fake_embeddings(len(SAMPLE_MESSAGES))[1]
 
-        if similar:
-            table = Table(show_header=True, header_style="bold cyan")
-            table.add_column("User", style="green")
-            table.add_column("Message", style="white")
-            table.add_column("Similarity", style="magenta")
+    # Size the HNSW candidate list for this corpus
+    hnsw_params = operations.configure_hnsw_params(len(SAMPLE_MESSAGES))
 
-            for message, score in similar:
-                table.add_row(
-                    message.user_name or message.user_id,
-                    message.message_text[:60]
-                    + ("..." if len(message.message_text) > 60 else ""),
-                    f"{score:.4f}",
-                )
+    # Search for similar messages
+    similar = await operations.search_similar_messages(
+        session,
+        query_embedding=query_embedding,
+        similarity_threshold=0.0,  # Low threshold since embeddings are random
+        limit=3,
+        ef_search=hnsw_params["ef_search"],
+    )
 
-            console.print(table)
-        else:
-            console.print(" No similar messages found")
+    if similar:
+        table = Table(show_header=True, header_style="bold cyan")
+        table.add_column("User", style="green")
+        table.add_column("Message", style="white")
+        table.add_column("Similarity", style="magenta")
+
+        rows = [
+            (
+                message.user_name or message.user_id,
+                truncate(message.message_text, 60),
+                f"{score:.4f}",
+            )
+            for message, score in similar
+        ]
+        for row in rows:
+            table.add_row(*row)
+
+        console.print(table)
+    else:
+        console.print(" No similar messages found")
 
     console.print()
 
 
-async def demo_soft_delete():
+async def demo_soft_delete(session: AsyncSession):
     """Demonstrate soft delete functionality."""
     console.print("[bold]7. Soft Delete[/bold]")
 
-    async with db_manager.get_session() as session:
-        # Get a message to delete
-        messages = await operations.get_messages_by_user(session, "U001", limit=1)
-
-        if messages:
-            message = messages[0]
-            console.print(f" Deleting message: '{message.message_text[:50]}...'")
-
-            # Soft delete
-            deleted = await operations.soft_delete_message(session, message.id)
-            await session.commit()
-
-            if deleted:
-                console.print(" Message soft deleted")
-
-                # Verify it's still in database but marked deleted
-                retrieved = await operations.get_slack_message_by_id(
-                    session, message.id
-                )
-                console.print(f" is_deleted flag: {retrieved.is_deleted}")
-
-                # Count excluding deleted
-                active_count = await operations.get_message_count(
-                    session, include_deleted=False
-                )
-                total_count = await operations.get_message_count(
-                    session, include_deleted=True
-                )
-                console.print(f" Active messages: {active_count}, Total: {total_count}")
+    # Get a message to delete
+    messages = await operations.get_messages_by_user(session, "U001", limit=1)
+
+    if messages:
+        message = messages[0]
+        console.print(f" Deleting message: '{message.message_text[:50]}...'")
+
+        # Soft delete
+        deleted = await operations.soft_delete_message(session, message.id)
+        await session.commit()
+
+        if deleted:
+            console.print(" Message soft deleted")
+
+            # Verify it's still in database but marked deleted
+            retrieved = await operations.get_slack_message_by_id(session, message.id)
+            console.print(f" is_deleted flag: {retrieved.is_deleted}")
+
+            # Count excluding deleted
+            active_count, total_count = await operations.get_message_counts(session)
+            console.print(f" Active messages: {active_count}, Total: {total_count}")
 
     console.print()
 
 
-async def demo_summary():
+async def demo_summary(session: AsyncSession):
     """Display final summary."""
     console.print("[bold]8. Summary[/bold]")
 
-    async with db_manager.get_session() as session:
-        total_messages = await operations.get_message_count(
-            session, include_deleted=True
-        )
-        active_messages = await operations.get_message_count(
-            session, include_deleted=False
-        )
+    # Message and user counts in one round-trip
+    from sqlalchemy import false, func, select
+    from ai_wingman.database.models import UserContext
 
-        # Count users
-        from sqlalchemy import select, func
-        from ai_wingman.database.models import UserContext
-
-        user_count_stmt = select(func.count(UserContext.id))
-        result = await session.execute(user_count_stmt)
-        user_count = result.scalar_one()
-
-        console.print(
-            Panel.fit(
-                f"[bold cyan]Demo Complete![/bold cyan]\n\n"
-                f" Total Messages: {total_messages}\n"
-                f" Active Messages: {active_messages}\n"
-                f" Users: {user_count}\n"
-                f"  Database: PostgreSQL + pgvector\n"
-                f" Embedding Dimension: {settings.embedding_dimension}",
-                border_style="green",
-            )
+    summary_stmt = select(
+        select(func.count(SlackMessage.id))
+        .where(SlackMessage.is_deleted == false())
+        .scalar_subquery(),
+        select(func.count(SlackMessage.id)).scalar_subquery(),
+        select(func.count(UserContext.id)).scalar_subquery(),
+    )
+    result = await session.execute(summary_stmt)
+    active_messages, total_messages, user_count = result.one()
+
+    console.print(
+        Panel.fit(
+            f"[bold cyan]Demo Complete![/bold cyan]\n\n"
+            f" Total Messages: {total_messages}\n"
+            f" Active Messages: {active_messages}\n"
+            f" Users: {user_count}\n"
+            f"  Database: PostgreSQL + pgvector\n"
+            f" Embedding Dimension: {EMBEDDING_DIMENSION}",
+            border_style="green",
         )
+    )
 
 
 async def cleanup():
@@ -408,9 +435,7 @@ async def cleanup():
     async with db_manager.get_session() as session:
         # Delete all demo data
         await session.execute(
-            text(
-                "DELETE FROM ai_wingman.slack_messages WHERE metadata->>'demo' = 'true'"
-            )
+            text("DELETE FROM ai_wingman.slack_messages WHERE is_demo")
         )
         await session.execute(text("DELETE FROM ai_wingman.user_contexts"))
         await session.commit()
@@ -433,16 +458,17 @@ async def main():
             console.print("[red]Database is not available. Exiting.[/red]")
             return
 
-        # Run demos
-        await demo_create_messages()
-        await demo_query_messages()
-        await demo_display_messages()
-        await demo_user_contexts()
-        await demo_similarity_search()
-        await demo_soft_delete()
-        await demo_summary()
-
-        # Cleanup
+        # Run demos on one shared session; each section commits its own writes
+        async with db_manager.get_session() as session:
+            await demo_create_messages(session)
+            await demo_query_messages()
+            await demo_display_messages(session)
+            await demo_user_contexts(session)
+            await demo_similarity_search(session)
+            await demo_soft_delete(session)
+            await demo_summary(session)
+
+        # Cleanup (separate session so it runs in its own transaction)
         await cleanup()
 
         console.print()
@@ -455,10 +481,16 @@ async def main():
         raise
     finally:
         # Close database connections
-        from ai_wingman.database import db_manager
-
         await db_manager.close()
 
 
 if __name__ == "__main__":
+    # uvloop is optional (not available on Windows); fall back to asyncio's loop
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(main())
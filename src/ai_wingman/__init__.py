@@ -8,9 +8,27 @@ intelligent responses using local LLM inference.
 __version__ = "0.1.0"
 __author__ = "Femi & Yongjun"
 
-from ai_wingman.config import settings
-from ai_wingman.database import get_session, db_manager
-from ai_wingman.utils import logger
+
+def __getattr__(name: str):
+    """Lazily import heavy top-level exports (PEP 562).
+
+    Keeps ``import ai_wingman`` from loading settings, logging and the
+    database layer until one of them is actually used.
+    """
+    if name == "settings":
+        from ai_wingman.config import settings
+
+        return settings
+    if name in ("get_session", "db_manager"):
+        from ai_wingman import database
+
+        return getattr(database, name)
+    if name == "logger":
+        from ai_wingman.utils import logger
+
+        return logger
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "__version__",
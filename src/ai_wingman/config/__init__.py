@@ -1,5 +1,5 @@
 """Configuration module."""
 
-from .settings import settings, Settings, print_settings
+from .settings import settings, Settings, get_settings, print_settings
 
-__all__ = ["settings", "Settings", "print_settings"]
+__all__ = ["settings", "Settings", "get_settings", "print_settings"]
@@ -4,6 +4,7 @@ Configuration management for AI Wingman.
 Loads settings from environment variables with validation.
 """
 
+from functools import lru_cache
 from typing import Optional, Literal
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -24,6 +25,9 @@ class Settings(BaseSettings):
         default="development", description="Application environment"
     )
     debug: bool = Field(default=True, description="Debug mode")
+    sql_echo: bool = Field(
+        default=False, description="Log every SQL statement (SQLAlchemy echo)"
+    )
 
     # Database Configuration
     postgres_user: str = Field(default="wingman", description="PostgreSQL username")
@@ -36,6 +40,19 @@ class Settings(BaseSettings):
         default="ai_wingman", description="PostgreSQL database name"
     )
 
+    # Connection Pool
+    db_pool_size: int = Field(default=5, description="Connection pool size")
+    db_max_overflow: int = Field(
+        default=10, description="Extra connections allowed beyond pool size"
+    )
+    db_disable_pool: bool = Field(
+        default=False, description="Open a fresh connection per session (NullPool)"
+    )
+    db_statement_cache_size: int = Field(
+        default=500,
+        description="Prepared statements cached per connection (0 disables)",
+    )
+
     # Computed database URL
     @property
     def database_url(self) -> str:
@@ -84,6 +101,9 @@ class Settings(BaseSettings):
     min_similarity_score: float = Field(
         default=0.7, description="Minimum similarity score for context retrieval"
     )
+    hnsw_ef_search: int = Field(
+        default=40, description="HNSW candidate list size for similarity search"
+    )
 
     # Logging
     log_level: str = Field(default="INFO", description="Logging level")
@@ -106,6 +126,22 @@ class Settings(BaseSettings):
             raise ValueError("embedding_dimension must be positive")
         return v
 
+    @field_validator("db_pool_size")
+    @classmethod
+    def validate_pool_size(cls, v: int) -> int:
+        """Ensure pool size is positive."""
+        if v <= 0:
+            raise ValueError("db_pool_size must be positive")
+        return v
+
+    @field_validator("hnsw_ef_search")
+    @classmethod
+    def validate_ef_search(cls, v: int) -> int:
+        """Ensure ef_search is within pgvector's accepted range."""
+        if not 1 <= v <= 1000:
+            raise ValueError("hnsw_ef_search must be between 1 and 1000")
+        return v
+
     @field_validator("top_k_results")
     @classmethod
     def validate_top_k(cls, v: int) -> int:
@@ -115,8 +151,19 @@ class Settings(BaseSettings):
         return v
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the settings singleton.
+
+    The environment and .env file are parsed on the first call only;
+    get_settings.cache_clear() forces a reload.
+    """
+    return Settings()
+
+
 # Singleton settings instance
-settings = Settings()
+settings = get_settings()
 
 
 # Helper function for debugging
@@ -4,6 +4,7 @@ from ai_wingman.database.connection import (
     DatabaseManager,
     db_manager,
     get_session,
+    register_vector_codecs,
 )
 from ai_wingman.database.models import (
     Base,
@@ -18,6 +19,7 @@ __all__ = [
     "DatabaseManager",
     "db_manager",
     "get_session",
+    "register_vector_codecs",
     # Models
     "Base",
     "SlackMessage",
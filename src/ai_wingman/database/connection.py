@@ -5,25 +5,52 @@ Provides async connection pooling and session management.
 """
 
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Optional
+import orjson
+from pgvector.asyncpg import register_vector
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     create_async_engine,
     async_sessionmaker,
 )
-from sqlalchemy.pool import NullPool, QueuePool
+from sqlalchemy.pool import NullPool
 from sqlalchemy import text
 
 from ai_wingman.config import settings
 from ai_wingman.utils import logger
 
 
+def register_vector_codecs(engine: AsyncEngine) -> None:
+    """
+    Install pgvector's binary codecs on every new connection of an engine.
+
+    Embedding columns (models.BinaryHalfVec) hand vectors to the driver as
+    HalfVector objects, which these codecs send as a packed fp16 block
+    instead of a formatted "[0.12,...]" string.
+
+    Args:
+        engine: Async engine using the asyncpg driver
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        dbapi_connection.run_async(register_vector)
+
+
+def _json_serializer(value: Any) -> str:
+    """Encode JSON/JSONB parameters with orjson (str keys coerced like json)."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class DatabaseManager:
     """Manages database connections and sessions."""
 
     def __init__(self) -> None:
         """Initialize database manager."""
+        # database_url is a computed property; build it once
+        self._url: str = settings.database_url
         self._engine: Optional[AsyncEngine] = None
         self._session_factory: Optional[async_sessionmaker[AsyncSession]] = None
 
@@ -34,31 +61,52 @@ class DatabaseManager:
             f"Creating database engine: {settings.postgres_host}:{settings.postgres_port}"
         )
 
-        # Choose pool configuration based on environment
-        if settings.app_env == "development":
-            # NullPool for development (no pool arguments)
+        # Each pooled asyncpg connection keeps an LRU of prepared statements,
+        # so repeated queries (e.g. the INSERT behind create_slack_message)
+        # skip the Parse/Describe round-trip after their first execution.
+        connect_args = {
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        }
+
+        # JSONB columns (metadata, topics_of_interest) are encoded/decoded
+        # by orjson in C instead of the stdlib json module
+        json_options = {
+            "json_serializer": _json_serializer,
+            "json_deserializer": orjson.loads,
+        }
+
+        # Choose pool configuration
+        if settings.db_disable_pool:
+            # NullPool: every session opens and closes its own connection
             logger.debug("Using NullPool (no connection pooling)")
 
             engine = create_async_engine(
-                settings.database_url,
-                echo=settings.debug,
+                self._url,
+                echo=settings.sql_echo,
                 poolclass=NullPool,
                 pool_pre_ping=True,
+                connect_args=connect_args,
+                **json_options,
             )
         else:
-            # QueuePool for production
-            logger.debug("Using QueuePool (connection pooling enabled)")
+            # Default async pool (AsyncAdaptedQueuePool), shared across sessions
+            logger.debug(
+                f"Using AsyncAdaptedQueuePool (size={settings.db_pool_size}, "
+                f"max_overflow={settings.db_max_overflow})"
+            )
 
             engine = create_async_engine(
-                settings.database_url,
-                echo=settings.debug,
-                poolclass=QueuePool,
-                pool_size=5,
-                max_overflow=10,
+                self._url,
+                echo=settings.sql_echo,
+                pool_size=settings.db_pool_size,
+                max_overflow=settings.db_max_overflow,
                 pool_pre_ping=True,
                 pool_recycle=3600,
+                connect_args=connect_args,
+                **json_options,
             )
 
+        register_vector_codecs(engine)
         return engine
 
     @property
@@ -140,4 +188,4 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-__all__ = ["DatabaseManager", "db_manager", "get_session"]
+__all__ = ["DatabaseManager", "db_manager", "get_session", "register_vector_codecs"]
@@ -6,30 +6,138 @@ Maps to PostgreSQL tables created in init.sql.
 
 from datetime import datetime
 from typing import Optional, Dict, Any
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     DateTime,
+    Index,
     Integer,
-    Numeric,
     String,
     Text,
+    TypeDecorator,
+    UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID as PGUUID
 from sqlalchemy.ext.asyncio import AsyncAttrs
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from pgvector.sqlalchemy import Vector
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, query_expression
+from pgvector.sqlalchemy import HALFVEC
+from pgvector.utils import HalfVector
+import numpy as np
+import orjson
+from uuid6 import uuid7
 
 from ai_wingman.config import settings
 
 
+class BinaryHalfVec(HALFVEC):
+    """
+    HALFVEC column exchanged with the driver in pgvector's binary format.
+
+    Values are handed to asyncpg as HalfVector objects for the codec that
+    connection.register_vector_codecs() installs, skipping the text
+    "[0.12,...]" formatting and parsing on every row. Loaded values come
+    back as float32 NumPy arrays, the dtype search_similar_messages takes.
+    """
+
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        dim = self.dim
+
+        def process(value):
+            if value is None:
+                return None
+            if not isinstance(value, HalfVector):
+                value = HalfVector(value)
+            if dim is not None and value.dimensions() != dim:
+                raise ValueError(f"expected {dim} dimensions, not {value.dimensions()}")
+            return value
+
+        return process
+
+    def result_processor(self, dialect, coltype):
+        def process(value):
+            if value is None:
+                return None
+            return HalfVector._from_db(value).to_numpy().astype(np.float32)
+
+        return process
+
+
+class SlackTimestamp(TypeDecorator):
+    """
+    Slack "seconds.microseconds" timestamp stored as BIGINT microseconds.
+
+    Fixed-width integers compare and index faster than NUMERIC(16, 6).
+    Python code keeps seeing float seconds; Slack's string form
+    ("1234567890.123456") is accepted on the way in.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return round(float(value) * 1_000_000)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return value / 1_000_000
+
+
+def _uuid7() -> UUID:
+    """Return a time-ordered UUIDv7 as a plain uuid.UUID (not uuid6's subclass)."""
+    return UUID(int=uuid7().int)
+
+
+def _to_json_value(value: Any) -> Any:
+    """Convert datetime/UUID values to their JSON string forms."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    """Encode values orjson rejects, e.g. asyncpg's and uuid6's UUID subclasses."""
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
 # Base class for all models
 class Base(AsyncAttrs, DeclarativeBase):
     """Base class for all SQLAlchemy models."""
 
-    pass
+    def _as_dict_fast(self) -> Dict[str, Any]:
+        """
+        Return column values with raw datetime/UUID objects.
+
+        Keyed by column name. Models override this with an explicit dict,
+        which is faster than walking the mapper and can drop or add keys.
+        """
+        mapper = self.__mapper__
+        return {
+            column.name: getattr(self, mapper.get_property_by_column(column).key)
+            for column in self.__table__.columns
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-compatible dictionary."""
+        return {
+            key: _to_json_value(value) for key, value in self._as_dict_fast().items()
+        }
+
+    def to_json(self) -> bytes:
+        """Serialize to JSON; orjson encodes datetime/UUID values natively."""
+        return orjson.dumps(self._as_dict_fast(), default=_json_default)
 
 
 class SlackMessage(Base):
@@ -40,43 +148,75 @@ class SlackMessage(Base):
     """
 
     __tablename__ = "slack_messages"
-    __table_args__ = {"schema": "ai_wingman"}
+    __table_args__ = (
+        # Mirrors the indexes in init.sql so tables bootstrapped through
+        # Base.metadata.create_all() are searchable without a Seq Scan
+        Index(
+            "idx_slack_messages_user_timestamp",
+            "user_id",
+            text("slack_timestamp DESC"),
+            postgresql_where=text("is_deleted = FALSE"),
+        ),
+        Index(
+            "idx_slack_messages_channel_timestamp",
+            "channel_id",
+            text("slack_timestamp DESC"),
+            postgresql_where=text("is_deleted = FALSE"),
+        ),
+        Index(
+            "idx_slack_messages_timestamp",
+            text("slack_timestamp DESC"),
+            postgresql_where=text("is_deleted = FALSE"),
+        ),
+        Index(
+            "idx_slack_messages_embedding",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 24, "ef_construction": 128},
+            postgresql_ops={"embedding": "halfvec_cosine_ops"},
+        ),
+        # init.sql hash-partitions this table by channel_id, so uniqueness
+        # can only be enforced per channel (the database primary key is
+        # likewise (id, channel_id); the ORM identity stays id alone)
+        UniqueConstraint(
+            "slack_message_id",
+            "channel_id",
+            name="uq_slack_messages_slack_message_id",
+        ),
+        {"schema": "ai_wingman"},
+    )
 
-    # Primary key
+    # Primary key: UUIDv7 generated client-side, so ids are time-ordered and
+    # inserts land on the rightmost index page instead of a random one
     id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
-        server_default=func.uuid_generate_v4(),
+        default=_uuid7,
     )
 
     # Slack metadata
-    slack_message_id: Mapped[str] = mapped_column(
-        String(100),
-        unique=True,
-        nullable=False,
-        index=True,
-    )
-    channel_id: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    slack_message_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    channel_id: Mapped[str] = mapped_column(String(100), nullable=False)
     channel_name: Mapped[Optional[str]] = mapped_column(String(255))
-    user_id: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(100), nullable=False)
     user_name: Mapped[Optional[str]] = mapped_column(String(255))
 
     # Message content
     message_text: Mapped[str] = mapped_column(Text, nullable=False)
     message_type: Mapped[str] = mapped_column(String(50), default="message")
 
-    # Vector embedding (384 dimensions for all-MiniLM-L6-v2)
-    embedding: Mapped[Optional[list[float]]] = mapped_column(
-        Vector(settings.embedding_dimension)
+    # Vector embedding (384 dimensions for all-MiniLM-L6-v2), stored as
+    # halfvec (fp16) to halve storage and index size
+    embedding: Mapped[Optional[np.ndarray]] = mapped_column(
+        BinaryHalfVec(settings.embedding_dimension)
     )
 
+    # Set by list queries that defer the embedding column (see
+    # operations.get_messages_by_user); None when not loaded that way
+    has_embedding: Mapped[Optional[bool]] = query_expression()
+
     # Timestamps
-    slack_timestamp: Mapped[float] = mapped_column(
-        Numeric(16, 6),
-        nullable=False,
-        index=True,
-    )
+    slack_timestamp: Mapped[float] = mapped_column(SlackTimestamp, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.current_timestamp(),
@@ -95,7 +235,10 @@ class SlackMessage(Base):
     )
 
     # Soft delete flag
-    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    # Demo/sample data flag (partial-indexed so cleanup avoids a seq scan)
+    is_demo: Mapped[bool] = mapped_column(Boolean, default=False)
 
     def __repr__(self) -> str:
         """String representation."""
@@ -106,10 +249,10 @@ class SlackMessage(Base):
             f"text='{self.message_text[:50]}...')>"
         )
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary (excluding embedding for brevity)."""
+    def _as_dict_fast(self) -> Dict[str, Any]:
+        """Return column values (excluding embedding for brevity)."""
         return {
-            "id": str(self.id),
+            "id": self.id,
             "slack_message_id": self.slack_message_id,
             "channel_id": self.channel_id,
             "channel_name": self.channel_name,
@@ -118,11 +261,16 @@ class SlackMessage(Base):
             "message_text": self.message_text,
             "message_type": self.message_type,
             "slack_timestamp": float(self.slack_timestamp),
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
             "metadata": self.metadata_,
             "is_deleted": self.is_deleted,
-            "has_embedding": self.embedding is not None,
+            "is_demo": self.is_demo,
+            "has_embedding": (
+                self.has_embedding
+                if self.has_embedding is not None
+                else self.embedding is not None
+            ),
         }
 
 
@@ -140,8 +288,7 @@ class UserContext(Base):
     id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
-        server_default=func.uuid_generate_v4(),
+        default=_uuid7,
     )
 
     # User identification
@@ -181,23 +328,19 @@ class UserContext(Base):
             f"messages={self.total_messages})>"
         )
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
+    def _as_dict_fast(self) -> Dict[str, Any]:
+        """Return column values."""
         return {
-            "id": str(self.id),
+            "id": self.id,
             "user_id": self.user_id,
             "user_name": self.user_name,
             "total_messages": self.total_messages,
-            "first_message_at": (
-                self.first_message_at.isoformat() if self.first_message_at else None
-            ),
-            "last_message_at": (
-                self.last_message_at.isoformat() if self.last_message_at else None
-            ),
+            "first_message_at": self.first_message_at,
+            "last_message_at": self.last_message_at,
             "communication_style": self.communication_style,
             "topics_of_interest": self.topics_of_interest,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
 
 
@@ -215,13 +358,12 @@ class ConversationThread(Base):
     id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
-        server_default=func.uuid_generate_v4(),
+        default=_uuid7,
     )
 
     # Thread identification
     thread_ts: Mapped[float] = mapped_column(
-        Numeric(16, 6),
+        SlackTimestamp,
         unique=True,
         nullable=False,
     )
@@ -250,26 +392,26 @@ class ConversationThread(Base):
             f"messages={self.message_count})>"
         )
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
+    def _as_dict_fast(self) -> Dict[str, Any]:
+        """Return column values."""
         return {
-            "id": str(self.id),
+            "id": self.id,
             "thread_ts": float(self.thread_ts),
             "channel_id": self.channel_id,
             "summary": self.summary,
             "participant_count": self.participant_count,
             "message_count": self.message_count,
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "last_activity_at": (
-                self.last_activity_at.isoformat() if self.last_activity_at else None
-            ),
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at,
+            "last_activity_at": self.last_activity_at,
+            "created_at": self.created_at,
         }
 
 
 # Export all models
 __all__ = [
     "Base",
+    "BinaryHalfVec",
+    "SlackTimestamp",
     "SlackMessage",
     "UserContext",
     "ConversationThread",
@@ -4,17 +4,55 @@ Database CRUD operations.
 Helper functions for common database tasks.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import AsyncGenerator, FrozenSet, List, Optional, Dict, Any, Union
 from uuid import UUID
 from datetime import datetime, timezone
 
-from sqlalchemy import select, update, func, text
+import numpy as np
+import orjson
+from sqlalchemy import (
+    Column,
+    bindparam,
+    exists,
+    false,
+    func,
+    insert,
+    lambda_stmt,
+    select,
+    text,
+    true,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, defer, with_expression
+from sqlalchemy.sql.schema import CallableColumnDefault, ScalarElementColumnDefault
 
+from ai_wingman.config import settings
 from ai_wingman.database.models import SlackMessage, UserContext, ConversationThread
 from ai_wingman.utils import logger
 
 
+# Embeddings may be plain lists or NumPy arrays; pgvector's column types
+# convert arrays directly without materializing Python floats first
+Embedding = Union[List[float], np.ndarray]
+
+# Per-row operations log at DEBUG with loguru's "{}" arguments rather than
+# f-strings, so nothing is formatted below the configured level; batch
+# operations keep a single INFO summary
+
+# bulk_create_messages switches from ORM inserts to COPY at this batch size
+COPY_THRESHOLD = 100
+
+# Rows fetched per round trip by the iter_messages_* server-side cursors
+STREAM_CHUNK_SIZE = 1000
+
+# ef_search values search_similar_messages escalates through when a search
+# comes back with fewer than `limit` rows
+HNSW_EF_SEARCH_STEPS = (40, 100, 200)
+
+
 # ============================================================================
 # Slack Message Operations
 # ============================================================================
@@ -30,7 +68,7 @@ async def create_slack_message(
     channel_name: Optional[str] = None,
     user_name: Optional[str] = None,
     message_type: str = "message",
-    embedding: Optional[List[float]] = None,
+    embedding: Optional[Embedding] = None,
     metadata: Optional[Dict[str, Any]] = None,
 ) -> SlackMessage:
     """
@@ -68,10 +106,57 @@ async def create_slack_message(
     session.add(message)
     await session.flush()  # Flush to get the generated ID
 
-    logger.info(f"Created Slack message: {message.slack_message_id}")
+    logger.debug("Created Slack message: {}", message.slack_message_id)
     return message
 
 
+async def create_slack_messages_batched(
+    session: AsyncSession,
+    messages: List[Dict[str, Any]],
+    batch_size: int = 500,
+) -> List[UUID]:
+    """
+    Insert Slack messages with one multi-row INSERT ... RETURNING per batch.
+
+    Messages whose slack_message_id already exists in their channel are
+    skipped (ON CONFLICT DO NOTHING), so re-ingesting a channel is
+    idempotent.
+    Consecutive dictionaries should share the same keys; each change of
+    key set starts a new statement.
+
+    Args:
+        session: Database session
+        messages: List of message dictionaries (SlackMessage attribute names)
+        batch_size: Maximum number of rows per INSERT statement
+
+    Returns:
+        IDs of the newly inserted messages
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+
+    stmt = (
+        pg_insert(SlackMessage)
+        .on_conflict_do_nothing(
+            index_elements=[SlackMessage.slack_message_id, SlackMessage.channel_id]
+        )
+        .returning(SlackMessage.id)
+    )
+
+    inserted: List[UUID] = []
+    for start in range(0, len(messages), batch_size):
+        result = await session.execute(stmt, messages[start : start + batch_size])
+        inserted.extend(result.scalars().all())
+
+    logger.info(f"Batch created {len(inserted)} of {len(messages)} messages")
+    return inserted
+
+
+# The single-row getters below build their SELECT inside lambda_stmt: the
+# statement is constructed and cache-keyed once per call site, and later
+# calls only re-bind the captured arguments as parameters.
+
+
 async def get_slack_message_by_id(
     session: AsyncSession,
     message_id: UUID,
@@ -86,7 +171,9 @@ async def get_slack_message_by_id(
     Returns:
         SlackMessage if found, None otherwise
     """
-    stmt = select(SlackMessage).where(SlackMessage.id == message_id)
+    stmt = lambda_stmt(
+        lambda: select(SlackMessage).where(SlackMessage.id == message_id)
+    )
     result = await session.execute(stmt)
     return result.scalar_one_or_none()
 
@@ -94,27 +181,51 @@ async def get_slack_message_by_id(
 async def get_slack_message_by_slack_id(
     session: AsyncSession,
     slack_message_id: str,
+    channel_id: str,
 ) -> Optional[SlackMessage]:
     """
     Get Slack message by Slack message ID.
 
+    Slack message IDs are only unique within a channel, so the channel is
+    required; it also lets Postgres scan a single partition.
+
     Args:
         session: Database session
         slack_message_id: Slack's message ID
+        channel_id: Channel the message was posted in
 
     Returns:
         SlackMessage if found, None otherwise
     """
-    stmt = select(SlackMessage).where(SlackMessage.slack_message_id == slack_message_id)
+    stmt = lambda_stmt(
+        lambda: select(SlackMessage).where(
+            SlackMessage.slack_message_id == slack_message_id,
+            SlackMessage.channel_id == channel_id,
+        )
+    )
     result = await session.execute(stmt)
     return result.scalar_one_or_none()
 
 
+# Live-row filters are written "is_deleted = false" rather than "IS false":
+# only the former matches the partial indexes' WHERE is_deleted = FALSE
+# predicate.
+
+# Loader options for list queries: skip the embedding (the bulk of each
+# row) and load only whether one is present. raiseload makes an accidental
+# access fail loudly instead of attempting a lazy load on an async session.
+_WITHOUT_EMBEDDING = (
+    defer(SlackMessage.embedding, raiseload=True),
+    with_expression(SlackMessage.has_embedding, SlackMessage.embedding.is_not(None)),
+)
+
+
 async def get_messages_by_user(
     session: AsyncSession,
     user_id: str,
     limit: int = 100,
     include_deleted: bool = False,
+    include_embedding: bool = False,
 ) -> List[SlackMessage]:
     """
     Get messages by user ID.
@@ -124,14 +235,18 @@ async def get_messages_by_user(
         user_id: Slack user ID
         limit: Maximum number of messages
         include_deleted: Include soft-deleted messages
+        include_embedding: Also load the embedding vectors
 
     Returns:
         List of SlackMessage instances
     """
     stmt = select(SlackMessage).where(SlackMessage.user_id == user_id)
 
+    if not include_embedding:
+        stmt = stmt.options(*_WITHOUT_EMBEDDING)
+
     if not include_deleted:
-        stmt = stmt.where(SlackMessage.is_deleted.is_(False))
+        stmt = stmt.where(SlackMessage.is_deleted == false())
 
     stmt = stmt.order_by(SlackMessage.slack_timestamp.desc()).limit(limit)
 
@@ -144,6 +259,7 @@ async def get_messages_by_channel(
     channel_id: str,
     limit: int = 100,
     include_deleted: bool = False,
+    include_embedding: bool = False,
 ) -> List[SlackMessage]:
     """
     Get messages by channel ID.
@@ -153,14 +269,18 @@ async def get_messages_by_channel(
         channel_id: Slack channel ID
         limit: Maximum number of messages
         include_deleted: Include soft-deleted messages
+        include_embedding: Also load the embedding vectors
 
     Returns:
         List of SlackMessage instances
     """
     stmt = select(SlackMessage).where(SlackMessage.channel_id == channel_id)
 
+    if not include_embedding:
+        stmt = stmt.options(*_WITHOUT_EMBEDDING)
+
     if not include_deleted:
-        stmt = stmt.where(SlackMessage.is_deleted.is_(False))
+        stmt = stmt.where(SlackMessage.is_deleted == false())
 
     stmt = stmt.order_by(SlackMessage.slack_timestamp.desc()).limit(limit)
 
@@ -168,13 +288,90 @@ async def get_messages_by_channel(
     return list(result.scalars().all())
 
 
+async def iter_messages_by_user(
+    session: AsyncSession,
+    user_id: str,
+    include_deleted: bool = False,
+    include_embedding: bool = False,
+) -> AsyncGenerator[SlackMessage, None]:
+    """
+    Stream all of a user's messages, newest first.
+
+    Rows come from a server-side cursor STREAM_CHUNK_SIZE at a time, so
+    memory stays flat however many messages the user has. The session must
+    stay open until iteration finishes.
+
+    Args:
+        session: Database session
+        user_id: Slack user ID
+        include_deleted: Include soft-deleted messages
+        include_embedding: Also load the embedding vectors
+
+    Yields:
+        SlackMessage instances
+    """
+    stmt = select(SlackMessage).where(SlackMessage.user_id == user_id)
+
+    if not include_embedding:
+        stmt = stmt.options(*_WITHOUT_EMBEDDING)
+
+    if not include_deleted:
+        stmt = stmt.where(SlackMessage.is_deleted == false())
+
+    stmt = stmt.order_by(SlackMessage.slack_timestamp.desc()).execution_options(
+        yield_per=STREAM_CHUNK_SIZE
+    )
+
+    result = await session.stream_scalars(stmt)
+    async for message in result:
+        yield message
+
+
+async def iter_messages_by_channel(
+    session: AsyncSession,
+    channel_id: str,
+    include_deleted: bool = False,
+    include_embedding: bool = False,
+) -> AsyncGenerator[SlackMessage, None]:
+    """
+    Stream all of a channel's messages, newest first.
+
+    See iter_messages_by_user() for the streaming behaviour.
+
+    Args:
+        session: Database session
+        channel_id: Slack channel ID
+        include_deleted: Include soft-deleted messages
+        include_embedding: Also load the embedding vectors
+
+    Yields:
+        SlackMessage instances
+    """
+    stmt = select(SlackMessage).where(SlackMessage.channel_id == channel_id)
+
+    if not include_embedding:
+        stmt = stmt.options(*_WITHOUT_EMBEDDING)
+
+    if not include_deleted:
+        stmt = stmt.where(SlackMessage.is_deleted == false())
+
+    stmt = stmt.order_by(SlackMessage.slack_timestamp.desc()).execution_options(
+        yield_per=STREAM_CHUNK_SIZE
+    )
+
+    result = await session.stream_scalars(stmt)
+    async for message in result:
+        yield message
+
+
 async def search_similar_messages(
     session: AsyncSession,
-    query_embedding: List[float],
+    query_embedding: Embedding,
     similarity_threshold: float = 0.7,
     limit: int = 5,
     user_id: Optional[str] = None,
     channel_id: Optional[str] = None,
+    ef_search: Optional[int] = None,
 ) -> List[tuple[SlackMessage, float]]:
     """Search for similar messages using vector similarity.
 
@@ -185,87 +382,90 @@ async def search_similar_messages(
         limit: Maximum number of results
         user_id: Optional filter by user
         channel_id: Optional filter by channel
+        ef_search: Fixed HNSW candidate list size (1-1000); by default the
+            search starts at settings.hnsw_ef_search and widens through
+            HNSW_EF_SEARCH_STEPS while results are short
 
     Returns:
         List of (SlackMessage, similarity_score) tuples
     """
-    # Use the SQL function we created in init.sql
-    # Note: We'll use raw SQL here since pgvector operations are best done in SQL
-
-    # Validate embedding values before string construction (security)
-    if not query_embedding:
+    # Validate embedding values before binding, as whole-array checks rather
+    # than a per-element Python loop; bool, string and object arrays are
+    # rejected by dtype kind
+    vector = np.asarray(query_embedding)
+    if vector.size == 0:
         raise ValueError("query_embedding cannot be empty")
-    
-    if not all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in query_embedding):
-        raise ValueError("Embedding must contain only numeric values")
-    
-    # Convert embedding list to PostgreSQL vector format
-    embedding_str = f"[{','.join(map(str, query_embedding))}]"
 
-    # Build WHERE clause based on optional parameters
-    where_clauses = [
-        "sm.is_deleted = FALSE",
-        "sm.embedding IS NOT NULL",
-        f"1 - (sm.embedding <=> '{embedding_str}'::vector) >= :threshold",
-    ]
+    if vector.dtype.kind not in "iuf":
+        raise ValueError("Embedding must contain only numeric values")
 
-    if user_id is not None:
-        where_clauses.append("sm.user_id = :user_id")
+    dimension = settings.embedding_dimension
+    if vector.shape != (dimension,):
+        raise ValueError(
+            f"Embedding must have shape ({dimension},), got {vector.shape}"
+        )
 
-    if channel_id is not None:
-        where_clauses.append("sm.channel_id = :channel_id")
+    vector = vector.astype(np.float32, copy=False)
+    if not np.isfinite(vector).all():
+        raise ValueError("Embedding must not contain NaN or infinite values")
 
-    where_clause = " AND ".join(where_clauses)
+    if ef_search is not None and not 1 <= ef_search <= 1000:
+        raise ValueError("ef_search must be between 1 and 1000")
 
-    # Use the dynamic WHERE clause
-    query = text(
-        f"""
-        SELECT
-            sm.*,
-            1 - (sm.embedding <=> '{embedding_str}'::vector) AS similarity
-        FROM ai_wingman.slack_messages sm
-        WHERE {where_clause}
-        ORDER BY sm.embedding <=> '{embedding_str}'::vector
-        LIMIT :limit
-    """
+    # The query vector is a single bound parameter typed like the column, so
+    # the SQL text is identical across calls and its prepared statement is
+    # reused from the connection's cache. The array goes to the binary
+    # halfvec codec as is, without a round trip through Python floats.
+    query_vector = bindparam(
+        "qvec", vector, type_=SlackMessage.__table__.c.embedding.type
     )
+    distance = SlackMessage.embedding.cosine_distance(query_vector).label("distance")
 
-    # Build parameters dict (no embedding needed now)
-    params = {
-        "threshold": similarity_threshold,
-        "limit": limit,
-    }
+    # Build the nearest-neighbour scan with optional filters
+    nearest = select(SlackMessage, distance).where(
+        SlackMessage.is_deleted == false(),
+        SlackMessage.embedding.is_not(None),
+    )
 
     if user_id is not None:
-        params["user_id"] = user_id
+        nearest = nearest.where(SlackMessage.user_id == user_id)
 
     if channel_id is not None:
-        params["channel_id"] = channel_id
-
-    result = await session.execute(query, params)
-    rows = result.fetchall()
-
-    # Convert rows to SlackMessage objects
-    messages_with_scores = []
-    for row in rows:
-        message = SlackMessage(
-            id=row.id,
-            slack_message_id=row.slack_message_id,
-            channel_id=row.channel_id,
-            channel_name=row.channel_name,
-            user_id=row.user_id,
-            user_name=row.user_name,
-            message_text=row.message_text,
-            message_type=row.message_type,
-            embedding=row.embedding,
-            slack_timestamp=row.slack_timestamp,
-            created_at=row.created_at,
-            updated_at=row.updated_at,
-            metadata_=row.metadata,
-            is_deleted=row.is_deleted,
-        )
-        similarity = float(row.similarity)
-        messages_with_scores.append((message, similarity))
+        nearest = nearest.where(SlackMessage.channel_id == channel_id)
+
+    # The inner ORDER BY ... LIMIT lets the HNSW index drive the scan and
+    # computes each distance once; rows come back nearest-first, so applying
+    # the threshold afterwards returns the same rows as filtering up front
+    nearest_sq = nearest.order_by(distance).limit(limit).subquery("nearest")
+    nearest_message = aliased(SlackMessage, nearest_sq)
+    similarity = (1 - nearest_sq.c.distance).label("similarity")
+
+    stmt = (
+        select(nearest_message, similarity)
+        .where(similarity >= similarity_threshold)
+        .order_by(nearest_sq.c.distance)
+    )
+
+    # Without an explicit ef_search, start with the cheap configured list
+    # and only widen it while fewer than `limit` rows pass the threshold
+    # and filters. The scan returns at most ef_search candidates, so never
+    # search a narrower list than the number of rows requested. An explicit
+    # ef_search is used exactly as given.
+    if ef_search is None:
+        first = settings.hnsw_ef_search
+        steps = [first] + [ef for ef in HNSW_EF_SEARCH_STEPS if ef > first]
+        schedule = list(dict.fromkeys(min(max(ef, limit), 1000) for ef in steps))
+    else:
+        schedule = [ef_search]
+
+    for ef in schedule:
+        await set_hnsw_ef_search(session, ef)
+        result = await session.execute(stmt)
+        messages_with_scores = [
+            (message, float(score)) for message, score in result.all()
+        ]
+        if len(messages_with_scores) >= limit:
+            break
 
     logger.info(f"Found {len(messages_with_scores)} similar messages")
     return messages_with_scores
@@ -274,7 +474,7 @@ async def search_similar_messages(
 async def update_message_embedding(
     session: AsyncSession,
     message_id: UUID,
-    embedding: List[float],
+    embedding: Embedding,
 ) -> Optional[SlackMessage]:
     """
     Update message embedding.
@@ -298,7 +498,7 @@ async def update_message_embedding(
     message = result.scalar_one_or_none()
 
     if message:
-        logger.info(f"Updated embedding for message: {message_id}")
+        logger.debug("Updated embedding for message: {}", message_id)
 
     return message
 
@@ -328,29 +528,64 @@ async def soft_delete_message(
     deleted = result.scalar_one_or_none()
 
     if deleted:
-        logger.info(f"Soft deleted message: {message_id}")
+        logger.debug("Soft deleted message: {}", message_id)
         return True
     return False
 
 
+# Sums the leaf relations' reltuples: a partitioned parent carries no
+# estimate of its own. Never-analyzed leaves (reltuples = -1) count as
+# empty when they have no pages on disk, as hash partitions of idle
+# channels do, since autovacuum never analyzes a table nobody writes to.
+# NULL only while a non-empty leaf has no estimate, in which case callers
+# fall back to COUNT(*).
+_ESTIMATED_ROWS = text(
+    """
+    SELECT CASE WHEN bool_or(c.reltuples < 0 AND pg_relation_size(c.oid) > 0)
+                THEN NULL
+                ELSE sum(GREATEST(c.reltuples, 0))::bigint END
+    FROM pg_class c
+    WHERE c.relkind <> 'p'
+      AND (c.oid = CAST(:table AS regclass)
+           OR c.oid IN (SELECT inhrelid FROM pg_inherits
+                        WHERE inhparent = CAST(:table AS regclass)))
+    """
+)
+_SLACK_MESSAGES_TABLE = f"{SlackMessage.__table__.schema}.{SlackMessage.__tablename__}"
+
+
 async def get_message_count(
     session: AsyncSession,
     user_id: Optional[str] = None,
     channel_id: Optional[str] = None,
     include_deleted: bool = False,
+    exact: bool = False,
 ) -> int:
     """
     Get count of messages.
 
+    An unfiltered count that includes deleted rows is answered from the
+    planner's row estimate (pg_class.reltuples, kept current by
+    ANALYZE/autovacuum) instead of scanning the table, unless exact is set.
+    Filtered counts are always exact.
+
     Args:
         session: Database session
         user_id: Optional filter by user
         channel_id: Optional filter by channel
         include_deleted: Include soft-deleted messages
+        exact: Always run COUNT(*), even when an estimate would do
 
     Returns:
         Message count
     """
+    if include_deleted and not (exact or user_id or channel_id):
+        estimate = await session.scalar(
+            _ESTIMATED_ROWS, {"table": _SLACK_MESSAGES_TABLE}
+        )
+        if estimate is not None:
+            return estimate
+
     stmt = select(func.count(SlackMessage.id))
 
     if user_id:
@@ -358,12 +593,92 @@ async def get_message_count(
     if channel_id:
         stmt = stmt.where(SlackMessage.channel_id == channel_id)
     if not include_deleted:
-        stmt = stmt.where(SlackMessage.is_deleted.is_(False))
+        stmt = stmt.where(SlackMessage.is_deleted == false())
 
     result = await session.execute(stmt)
     return result.scalar_one()
 
 
+async def get_message_counts(
+    session: AsyncSession,
+    user_id: Optional[str] = None,
+    channel_id: Optional[str] = None,
+) -> tuple[int, int]:
+    """
+    Get active and total message counts in a single query.
+
+    Args:
+        session: Database session
+        user_id: Optional filter by user
+        channel_id: Optional filter by channel
+
+    Returns:
+        Tuple of (active_count, total_count), where active excludes
+        soft-deleted messages
+    """
+    stmt = select(
+        func.count(SlackMessage.id).filter(SlackMessage.is_deleted == false()),
+        func.count(SlackMessage.id),
+    )
+
+    if user_id:
+        stmt = stmt.where(SlackMessage.user_id == user_id)
+    if channel_id:
+        stmt = stmt.where(SlackMessage.channel_id == channel_id)
+
+    result = await session.execute(stmt)
+    active, total = result.one()
+    return active, total
+
+
+# ============================================================================
+# Vector Index Tuning
+# ============================================================================
+
+
+def configure_hnsw_params(vector_count: int) -> Dict[str, int]:
+    """
+    Pick HNSW parameters for a corpus of the given size.
+
+    Larger graphs need more links per node (m) and wider candidate lists
+    (ef_construction at build time, ef_search at query time) to keep
+    recall up.
+
+    Args:
+        vector_count: Number of embedded vectors in the index
+
+    Returns:
+        Dict with "m", "ef_construction" and "ef_search" keys
+    """
+    if vector_count < 100_000:
+        return {"m": 16, "ef_construction": 64, "ef_search": 40}
+    if vector_count < 1_000_000:
+        return {"m": 24, "ef_construction": 128, "ef_search": 100}
+    return {"m": 32, "ef_construction": 200, "ef_search": 200}
+
+
+async def set_hnsw_ef_search(
+    session: AsyncSession,
+    ef_search: int,
+) -> None:
+    """
+    Set hnsw.ef_search for the current transaction (SET LOCAL semantics).
+
+    Args:
+        session: Database session
+        ef_search: Size of the HNSW candidate list (1-1000)
+    """
+    if not 1 <= ef_search <= 1000:
+        raise ValueError("ef_search must be between 1 and 1000")
+
+    # SET cannot take bind parameters; set_config(..., true) is the
+    # parameterised equivalent of SET LOCAL
+    await session.execute(
+        text("SELECT set_config('hnsw.ef_search', :value, true)"),
+        {"value": str(ef_search)},
+    )
+
+
 # ============================================================================
 # User Context Operations
 # ============================================================================
@@ -393,7 +708,7 @@ async def create_user_context(
     session.add(context)
     await session.flush()
 
-    logger.info(f"Created user context: {user_id}")
+    logger.debug("Created user context: {}", user_id)
     return context
 
 
@@ -411,7 +726,9 @@ async def get_user_context(
     Returns:
         UserContext if found
     """
-    stmt = select(UserContext).where(UserContext.user_id == user_id)
+    stmt = lambda_stmt(
+        lambda: select(UserContext).where(UserContext.user_id == user_id)
+    )
     result = await session.execute(stmt)
     return result.scalar_one_or_none()
 
@@ -432,10 +749,28 @@ async def get_or_create_user_context(
     Returns:
         UserContext instance
     """
-    context = await get_user_context(session, user_id)
+    # One round-trip either way: the CTE inserts the row unless user_id
+    # already exists, and the UNION falls back to the existing row. DO
+    # NOTHING (rather than a no-op DO UPDATE) keeps lookups of existing
+    # users read-only, without bumping updated_at via its trigger.
+    table = UserContext.__table__
+    inserted = (
+        pg_insert(UserContext)
+        .values(user_id=user_id, user_name=user_name)
+        .on_conflict_do_nothing(index_elements=[UserContext.user_id])
+        .returning(*table.c)
+        .cte("inserted")
+    )
+    existing = select(table).where(
+        table.c.user_id == user_id, ~exists(select(inserted.c.id))
+    )
+    stmt = select(UserContext).from_statement(union_all(select(inserted), existing))
+    context = await session.scalar(stmt)
 
     if context is None:
-        context = await create_user_context(session, user_id, user_name)
+        # A concurrent transaction inserted the user after this
+        # statement's snapshot was taken; it is committed by now
+        context = await get_user_context(session, user_id)
 
     return context
 
@@ -456,21 +791,23 @@ async def update_user_context_stats(
     Returns:
         Updated UserContext if found
     """
-    # Get current context
-    context = await get_user_context(session, user_id)
+    # Single atomic UPDATE ... RETURNING: no read-modify-write race between
+    # concurrent ingesters and one round-trip instead of two
+    stmt = (
+        update(UserContext)
+        .where(UserContext.user_id == user_id)
+        .values(
+            total_messages=UserContext.total_messages + increment_messages,
+            last_message_at=func.now(),
+            first_message_at=func.coalesce(UserContext.first_message_at, func.now()),
+        )
+        .returning(UserContext)
+    )
+    context = await session.scalar(stmt)
     if not context:
         return None
 
-    # Update stats
-    context.total_messages += increment_messages
-    context.last_message_at = datetime.now(timezone.utc)
-
-    if context.first_message_at is None:
-        context.first_message_at = datetime.now(timezone.utc)
-
-    await session.flush()
-
-    logger.info(f"Updated stats for user: {user_id}")
+    logger.debug("Updated stats for user: {}", user_id)
     return context
 
 
@@ -504,7 +841,7 @@ async def create_conversation_thread(
     session.add(thread)
     await session.flush()
 
-    logger.info(f"Created conversation thread: {thread_ts}")
+    logger.debug("Created conversation thread: {}", thread_ts)
     return thread
 
 
@@ -522,7 +859,11 @@ async def get_conversation_thread(
     Returns:
         ConversationThread if found
     """
-    stmt = select(ConversationThread).where(ConversationThread.thread_ts == thread_ts)
+    stmt = lambda_stmt(
+        lambda: select(ConversationThread).where(
+            ConversationThread.thread_ts == thread_ts
+        )
+    )
     result = await session.execute(stmt)
     return result.scalar_one_or_none()
 
@@ -543,17 +884,59 @@ async def update_thread_activity(
     Returns:
         Updated ConversationThread if found
     """
-    thread = await get_conversation_thread(session, thread_ts)
+    stmt = (
+        update(ConversationThread)
+        .where(ConversationThread.thread_ts == thread_ts)
+        .values(
+            message_count=ConversationThread.message_count + increment_messages,
+            last_activity_at=func.now(),
+        )
+        .returning(ConversationThread)
+    )
+    thread = await session.scalar(stmt)
     if not thread:
         return None
 
-    thread.message_count += increment_messages
-    thread.last_activity_at = datetime.now(timezone.utc)
+    logger.debug("Updated thread activity: {}", thread_ts)
+    return thread
 
-    await session.flush()
 
-    logger.info(f"Updated thread activity: {thread_ts}")
-    return thread
+async def lookup_context_and_thread(
+    session: AsyncSession,
+    user_id: str,
+    thread_ts: float,
+) -> tuple[Optional[UserContext], Optional[ConversationThread]]:
+    """
+    Get a user's context and a conversation thread in one round trip.
+
+    Both lookups hit a unique key, so the two single-row subqueries are
+    FULL JOINed into at most one row. Unlike asyncio.gather() over the
+    individual getters, this is safe on a single session.
+
+    Args:
+        session: Database session
+        user_id: Slack user ID
+        thread_ts: Slack thread timestamp
+
+    Returns:
+        (UserContext, ConversationThread) tuple; either may be None
+    """
+    user_row = select(UserContext).where(UserContext.user_id == user_id).subquery("u")
+    thread_row = (
+        select(ConversationThread)
+        .where(ConversationThread.thread_ts == thread_ts)
+        .subquery("t")
+    )
+    context = aliased(UserContext, user_row)
+    thread = aliased(ConversationThread, thread_row)
+
+    stmt = select(context, thread).select_from(
+        user_row.join(thread_row, true(), full=True)
+    )
+    row = (await session.execute(stmt)).first()
+    if row is None:
+        return None, None
+    return row[0], row[1]
 
 
 # ============================================================================
@@ -568,6 +951,10 @@ async def bulk_create_messages(
     """
     Bulk insert Slack messages.
 
+    Batches of COPY_THRESHOLD rows or more are streamed with COPY; smaller
+    ones, where COPY's setup cost would dominate, are sent as one bulk
+    INSERT without building ORM objects or unit-of-work state.
+
     Args:
         session: Database session
         messages: List of message dictionaries
@@ -575,27 +962,139 @@ async def bulk_create_messages(
     Returns:
         Number of messages created
     """
-    message_objects = [SlackMessage(**msg_data) for msg_data in messages]
-    session.add_all(message_objects)
-    await session.flush()
+    unknown = set().union(*messages) - _message_columns().keys()
+    if unknown:
+        raise ValueError(f"Unknown SlackMessage fields: {sorted(unknown)}")
+
+    if len(messages) >= COPY_THRESHOLD:
+        await _copy_messages(session, messages)
+        logger.info(f"Bulk copied {len(messages)} messages")
+        return len(messages)
+
+    if not messages:
+        return 0
+
+    await session.execute(insert(SlackMessage), messages)
+
+    logger.info(f"Bulk created {len(messages)} messages")
+    return len(messages)
+
+
+def _message_columns() -> Dict[str, Any]:
+    """Map SlackMessage attribute names to their table columns."""
+    mapper = SlackMessage.__mapper__
+    return {
+        mapper.get_property_by_column(column).key: column
+        for column in SlackMessage.__table__.columns
+    }
+
+
+async def _copy_messages(
+    session: AsyncSession,
+    messages: List[Dict[str, Any]],
+) -> None:
+    """
+    Load message dictionaries into slack_messages with binary COPY.
+
+    Records go through the same asyncpg codecs as ordinary binds, so
+    embeddings are sent as packed fp16 by the halfvec codec that
+    connection.register_vector_codecs() installs.
+
+    Args:
+        session: Database session
+        messages: List of message dictionaries (SlackMessage attribute names)
+    """
+    columns = _message_columns()
+    connection = await session.connection()
+    embed = SlackMessage.__table__.c.embedding.type.bind_processor(connection.dialect)
+    stamp = SlackMessage.__table__.c.slack_timestamp.type.bind_processor(
+        connection.dialect
+    )
+    if embed is None or stamp is None:
+        raise RuntimeError("embedding or slack_timestamp has no bind processor")
+
+    driver = (await connection.get_raw_connection()).driver_connection
+    if driver is None:
+        raise RuntimeError("COPY needs a live asyncpg connection")
+    if not driver.is_in_transaction():
+        # The asyncpg adapter opens its transaction lazily on the first
+        # statement; start it now so the COPY commits/rolls back with the session
+        await connection.execute(text("SELECT 1"))
+
+    # One COPY per distinct set of keys, like executemany: columns a row
+    # leaves out get their server default rather than NULL
+    groups: Dict[FrozenSet[str], List[Dict[str, Any]]] = {}
+    for msg_data in messages:
+        groups.setdefault(frozenset(msg_data), []).append(msg_data)
+
+    for given, group in groups.items():
+        # COPY only applies server defaults, so also send every column that
+        # has a client-side default (the primary key, flags)
+        copied = [
+            (key, column)
+            for key, column in columns.items()
+            if key in given or column.default is not None
+        ]
+
+        records = []
+        for msg_data in group:
+            record = []
+            for key, column in copied:
+                if key in msg_data:
+                    value = msg_data[key]
+                else:
+                    value = _client_default(column)
+
+                if key == "embedding":
+                    value = embed(value)
+                elif key == "slack_timestamp":
+                    value = stamp(value)
+                elif key == "metadata_":
+                    value = orjson.dumps(
+                        value or {}, option=orjson.OPT_NON_STR_KEYS
+                    ).decode()
+                record.append(value)
+            records.append(tuple(record))
+
+        await driver.copy_records_to_table(
+            SlackMessage.__tablename__,
+            schema_name=SlackMessage.__table__.schema,
+            columns=[column.name for _, column in copied],
+            records=records,
+        )
+
 
-    logger.info(f"Bulk created {len(message_objects)} messages")
-    return len(message_objects)
+def _client_default(column: Column) -> Any:
+    """Evaluate a column's client-side default (scalar or callable)."""
+    default = column.default
+    if isinstance(default, CallableColumnDefault):
+        # The wrapped default (_uuid7) ignores the execution context
+        return default.arg(None)  # type: ignore[arg-type]
+    if isinstance(default, ScalarElementColumnDefault):
+        return default.arg
+    raise ValueError(f"Column {column.name} has no client-side default")
 
 
 # Export all operations
 __all__ = [
     # Slack messages
     "create_slack_message",
+    "create_slack_messages_batched",
     "get_slack_message_by_id",
     "get_slack_message_by_slack_id",
     "get_messages_by_user",
     "get_messages_by_channel",
+    "iter_messages_by_user",
+    "iter_messages_by_channel",
     "search_similar_messages",
     "update_message_embedding",
     "soft_delete_message",
     "get_message_count",
+    "get_message_counts",
     "bulk_create_messages",
+    # Vector index tuning
+    "configure_hnsw_params",
+    "set_hnsw_ef_search",
     # User contexts
     "create_user_context",
     "get_user_context",
@@ -605,4 +1104,5 @@ __all__ = [
     "create_conversation_thread",
     "get_conversation_thread",
     "update_thread_activity",
+    "lookup_context_and_thread",
 ]
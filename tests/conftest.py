@@ -5,14 +5,53 @@ Provides reusable test components for all tests.
 """
 
 import asyncio
-from typing import AsyncGenerator, Generator
+import os
+import re
+from types import MappingProxyType
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generator, List, Mapping
+from uuid import UUID
+import numpy as np
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy import Index, insert, make_url, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateIndex
 
 from ai_wingman.config import settings
-from ai_wingman.database.models import Base
-from ai_wingman.database.connection import db_manager
+
+# Under pytest-xdist (pytest -n auto) every worker gets its own database,
+# e.g. ai_wingman_gw0, so one worker's DELETE/TRUNCATE never blocks or
+# empties another's tables. This must run before ai_wingman.database is
+# imported: db_manager reads the URL when it is created.
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+if XDIST_WORKER:
+    settings.postgres_db = f"{settings.postgres_db}_{XDIST_WORKER}"
+
+from ai_wingman.database.models import (  # noqa: E402
+    Base,
+    ConversationThread,
+    SlackMessage,
+    UserContext,
+)
+from ai_wingman.database import operations  # noqa: E402
+from ai_wingman.database.connection import db_manager  # noqa: E402
+
+# First pgvector release with the halfvec type used by the embedding column
+PGVECTOR_MIN_VERSION = (0, 7)
+
+# Fresh test databases skip the HNSW index: the test tables hold a handful
+# of rows, so it only makes every insert maintain a graph nothing scans.
+# Tests of the index path request hnsw_index; TEST_WITH_HNSW=1 restores it
+# for the whole schema. Databases initialized from init.sql keep theirs.
+HNSW_INDEX = next(
+    index
+    for index in SlackMessage.__table__.indexes
+    if index.name == "idx_slack_messages_embedding"
+)
+HNSW_INDEX.ddl_if(
+    callable_=lambda *args, **kwargs: bool(os.environ.get("TEST_WITH_HNSW"))
+)
 
 
 # ============================================================================
@@ -37,114 +76,291 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
 # ============================================================================
 
 
+# The session-scoped fixtures below are synchronous and drive the session
+# event loop themselves: pytest-asyncio 0.23 runs session-scoped *async*
+# fixtures in a loop of its own, and asyncpg connections cannot be shared
+# across loops.
+
+
 @pytest.fixture(scope="session")
-async def test_engine():
+def test_engine(event_loop) -> Generator[AsyncEngine, None, None]:
     """
-    Create test database engine.
+    Provide the application's engine for the whole test session.
 
-    Uses the database configured in .env (should be test database).
+    Tests share db_manager's pool, so connections (and their vector codecs
+    and prepared statements) are set up once and configured exactly as in
+    the application. Uses the database configured in .env (should be test
+    database).
     """
-    engine = create_async_engine(
-        settings.database_url,
-        echo=False,  # Don't log SQL during tests
-        pool_pre_ping=True,
+    yield db_manager.engine
+
+    # Cleanup
+    event_loop.run_until_complete(db_manager.close())
+
+
+def _is_disposable_database() -> bool:
+    """True for xdist worker databases and databases named as test databases."""
+    if XDIST_WORKER:
+        # ai_wingman_gw0 etc., created for the run by _create_test_database
+        return True
+    return re.search(r"(^|_)test(_|$)", settings.postgres_db) is not None
+
+
+async def _create_test_database() -> None:
+    """Create the disposable test database if it does not exist yet."""
+    admin = create_async_engine(
+        make_url(settings.database_url).set(database="postgres"),
+        poolclass=NullPool,
+        isolation_level="AUTOCOMMIT",
     )
+    async with admin.connect() as conn:
+        exists = await conn.scalar(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"),
+            {"name": settings.postgres_db},
+        )
+        if not exists:
+            await conn.execute(text(f'CREATE DATABASE "{settings.postgres_db}"'))
+    await admin.dispose()
 
-    yield engine
 
-    # Cleanup
-    await engine.dispose()
+async def _create_schema(engine: AsyncEngine) -> None:
+    """Create the extension, schema and tables, keeping existing objects."""
+    if _is_disposable_database():
+        await _create_test_database()
+
+    # The vector codecs can only be registered once the extension exists,
+    # so bootstrap it over a plain connection first
+    bootstrap = create_async_engine(settings.database_url, poolclass=NullPool)
+    try:
+        async with bootstrap.begin() as conn:
+            try:
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+            except DBAPIError as e:
+                pytest.exit(f"pgvector extension is not available: {e}", returncode=1)
+            await conn.execute(text("CREATE SCHEMA IF NOT EXISTS ai_wingman"))
+            version, schema = (
+                await conn.execute(
+                    text(
+                        "SELECT "
+                        "(SELECT extversion FROM pg_extension WHERE extname = 'vector'), "
+                        "(SELECT schema_name FROM information_schema.schemata "
+                        "WHERE schema_name = 'ai_wingman')"
+                    )
+                )
+            ).one()
+    finally:
+        await bootstrap.dispose()
+
+    # Checked once here instead of by per-run tests; nothing else can pass
+    # without them
+    if version is None:
+        pytest.exit("pgvector extension is not installed", returncode=1)
+    if tuple(int(part) for part in version.split(".")[:2]) < PGVECTOR_MIN_VERSION:
+        pytest.exit(
+            f"pgvector {version} has no halfvec type; "
+            "run ALTER EXTENSION vector UPDATE (needs 0.7+)",
+            returncode=1,
+        )
+    if schema != "ai_wingman":
+        pytest.exit("ai_wingman schema does not exist", returncode=1)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    await _warm_statement_cache(engine)
+
+
+async def _warm_statement_cache(engine: AsyncEngine) -> None:
+    """
+    Run the hot CRUD operations once, rolled back.
+
+    Fills SQLAlchemy's compiled cache and the pooled connection's asyncpg
+    statement cache, so the first test doesn't pay for compiling and
+    preparing them.
+    """
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection)
+        try:
+            message = await operations.create_slack_message(
+                session,
+                slack_message_id="warm-up",
+                channel_id="C0",
+                user_id="U0",
+                message_text="warm-up",
+                slack_timestamp=0.0,
+            )
+            await operations.get_slack_message_by_id(session, message.id)
+            await operations.get_slack_message_by_slack_id(session, "warm-up", "C0")
+            await operations.get_messages_by_user(session, "U0")
+            await operations.get_messages_by_channel(session, "C0")
+            await operations.get_message_count(session)
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+@pytest.fixture(scope="session")
+def test_schema(event_loop, test_engine) -> AsyncEngine:
+    """
+    Create the database schema once per test session.
+
+    A database initialized from init.sql is used as is.
+    """
+    event_loop.run_until_complete(_create_schema(test_engine))
+    return test_engine
 
 
 @pytest.fixture(scope="function")
-async def db_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
+async def db_session(test_schema) -> AsyncGenerator[AsyncSession, None]:
     """
     Create a database session for each test.
 
-    Automatically rolls back after each test to keep tests isolated.
+    The test runs inside an outer transaction that is rolled back on
+    teardown; session.commit() only releases a SAVEPOINT, so code under
+    test can commit without leaving rows behind. Tests themselves should
+    flush() instead: the session sees its flushed rows without the extra
+    SAVEPOINT round trips.
     """
-    # Create a connection
-    async with test_engine.connect() as connection:
-        # Begin a transaction
+    async with test_schema.connect() as connection:
         transaction = await connection.begin()
-
-        # Create session bound to this connection
-        session_factory = async_sessionmaker(
+        session = AsyncSession(
             bind=connection,
-            class_=AsyncSession,
+            join_transaction_mode="create_savepoint",
             expire_on_commit=False,
         )
 
-        async with session_factory() as session:
+        try:
             yield session
-
-            # Rollback transaction after test
+        finally:
+            await session.close()
             await transaction.rollback()
 
 
 @pytest.fixture(scope="function")
 async def clean_db(db_session: AsyncSession) -> AsyncSession:
     """
-    Provide a clean database session with all tables created.
+    Provide a database session that sees empty tables.
 
-    This fixture ensures tables exist and are empty for each test.
+    Rows already in the database are deleted inside the test's
+    transaction, so they come back when it rolls back.
     """
-    # Create all tables (if they don't exist)
-    async with db_manager.engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-    # Clean all tables
     await db_session.execute(text("DELETE FROM ai_wingman.slack_messages"))
     await db_session.execute(text("DELETE FROM ai_wingman.user_contexts"))
     await db_session.execute(text("DELETE FROM ai_wingman.conversation_threads"))
-    await db_session.commit()
 
     return db_session
 
 
+@pytest.fixture(scope="function")
+async def truncate_db(test_schema) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provide a session whose commits are real, emptying the tables afterwards.
+
+    For tests that need committed rows to be visible to other connections
+    (e.g. db_manager sessions); everything else should use clean_db, whose
+    SAVEPOINT rollback is cheaper. Skipped unless the database is a
+    disposable one (see _is_disposable_database).
+    """
+    if not _is_disposable_database():
+        pytest.skip(
+            f"truncate_db would empty {settings.postgres_db!r}; use a test "
+            "database (e.g. POSTGRES_DB=ai_wingman_test) or pytest -n"
+        )
+
+    async with AsyncSession(test_schema, expire_on_commit=False) as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
+            await session.execute(
+                text(
+                    "TRUNCATE ai_wingman.slack_messages, ai_wingman.user_contexts, "
+                    "ai_wingman.conversation_threads RESTART IDENTITY CASCADE"
+                )
+            )
+            await session.commit()
+
+
 # ============================================================================
 # Test Data Fixtures
 # ============================================================================
 
 
-@pytest.fixture
-def sample_message_data() -> dict:
+# Sample data is built once per session and handed out read-only; tests
+# that need a variant take a copy, e.g. dict(sample_message_data, ...)
+
+
+@pytest.fixture(scope="session")
+def sample_message_data() -> Mapping[str, Any]:
     """Sample Slack message data for testing."""
-    return {
-        "slack_message_id": "1234567890.123456",
-        "channel_id": "C01234567",
-        "channel_name": "general",
-        "user_id": "U01234567",
-        "user_name": "testuser",
-        "message_text": "This is a test message for AI Wingman",
-        "message_type": "message",
-        "slack_timestamp": 1234567890.123456,
-        "metadata": {"source": "test", "tags": ["test", "sample"]},
-    }
+    return MappingProxyType(
+        {
+            "slack_message_id": "1234567890.123456",
+            "channel_id": "C01234567",
+            "channel_name": "general",
+            "user_id": "U01234567",
+            "user_name": "testuser",
+            "message_text": "This is a test message for AI Wingman",
+            "message_type": "message",
+            "slack_timestamp": 1234567890.123456,
+            "metadata": {"source": "test", "tags": ["test", "sample"]},
+        }
+    )
 
 
-@pytest.fixture
-def sample_embedding() -> list[float]:
-    """Sample 384-dimensional embedding vector."""
-    return [0.1] * 384  # Simple vector for testing
+@pytest.fixture(scope="session")
+def sample_embedding() -> np.ndarray:
+    """Sample 384-dimensional float32 embedding vector (read-only)."""
+    embedding = np.full(384, 0.1, dtype=np.float32)  # Simple vector for testing
+    embedding.setflags(write=False)
+    return embedding
 
 
-@pytest.fixture
-def sample_user_data() -> dict:
+@pytest.fixture(scope="session")
+def sample_user_data() -> Mapping[str, Any]:
     """Sample user context data."""
-    return {
-        "user_id": "U01234567",
-        "user_name": "testuser",
-    }
+    return MappingProxyType(
+        {
+            "user_id": "U01234567",
+            "user_name": "testuser",
+        }
+    )
 
 
-@pytest.fixture
-def sample_thread_data() -> dict:
+@pytest.fixture(scope="session")
+def sample_thread_data() -> Mapping[str, Any]:
     """Sample conversation thread data."""
-    return {
-        "thread_ts": 1234567890.123456,
-        "channel_id": "C01234567",
-    }
+    return MappingProxyType(
+        {
+            "thread_ts": 1234567890.123456,
+            "channel_id": "C01234567",
+        }
+    )
+
+
+# Transient model instances, built once since their input is immutable.
+# Only for tests that don't mutate them or add them to a session.
+
+
+@pytest.fixture(scope="session")
+def slack_message_instance(sample_message_data: Mapping[str, Any]) -> SlackMessage:
+    """Unsaved SlackMessage built from sample_message_data."""
+    return SlackMessage(**sample_message_data)
+
+
+@pytest.fixture(scope="session")
+def user_context_instance(sample_user_data: Mapping[str, Any]) -> UserContext:
+    """Unsaved UserContext built from sample_user_data."""
+    return UserContext(**sample_user_data)
+
+
+@pytest.fixture(scope="session")
+def conversation_thread_instance(
+    sample_thread_data: Mapping[str, Any]
+) -> ConversationThread:
+    """Unsaved ConversationThread built from sample_thread_data."""
+    return ConversationThread(**sample_thread_data)
 
 
 # ============================================================================
@@ -153,12 +369,82 @@ def sample_thread_data() -> dict:
 
 
 @pytest.fixture
-async def db_health_check() -> bool:
-    """Check if database is accessible."""
+def create_messages(
+    clean_db: AsyncSession, sample_message_data: Mapping[str, Any]
+) -> Callable[[int], Awaitable[List[UUID]]]:
+    """
+    Insert variants of sample_message_data with a single statement.
+
+    Message i gets slack_message_id "msg_{i}" and a slack_timestamp i
+    seconds after the sample's, so ordering by time follows i. Being a
+    Core insert, the rows are sent at once and nothing is left pending
+    in the session to flush.
+
+    Returns:
+        Async function taking the number of messages and returning their
+        IDs in insertion order
+    """
+    base = dict(sample_message_data)
+    base["metadata_"] = base.pop("metadata")
+
+    async def create(count: int) -> List[UUID]:
+        rows = [
+            {
+                **base,
+                "slack_message_id": f"msg_{i}",
+                "slack_timestamp": base["slack_timestamp"] + i,
+            }
+            for i in range(count)
+        ]
+        result = await clean_db.execute(
+            insert(SlackMessage).returning(
+                SlackMessage.id, sort_by_parameter_order=True
+            ),
+            rows,
+        )
+        return list(result.scalars())
+
+    return create
+
+
+@pytest.fixture(scope="session")
+def hnsw_index(event_loop, test_schema) -> Index:
+    """Create the HNSW embedding index skipped by the test bootstrap."""
+
+    async def create() -> None:
+        async with test_schema.begin() as conn:
+            await conn.execute(CreateIndex(HNSW_INDEX, if_not_exists=True))
+
+    event_loop.run_until_complete(create())
+    return HNSW_INDEX
+
+
+@pytest.fixture(scope="session")
+def db_health_check(event_loop) -> bool:
+    """
+    Check if database is accessible, once per test session.
+
+    Probes with a plain SELECT 1 before anything else touches the server:
+    no schema bootstrap and no vector codecs, which need the extension.
+    A disposable test database may not exist yet, so its server is probed
+    through the postgres database instead. Synchronous like the other
+    session fixtures (see above test_engine). A failed probe skips every
+    test that uses it.
+    """
+    url = make_url(settings.database_url)
+    if _is_disposable_database():
+        url = url.set(database="postgres")
+
+    async def probe() -> None:
+        engine = create_async_engine(url, poolclass=NullPool)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        finally:
+            await engine.dispose()
+
     try:
-        is_healthy = await db_manager.health_check()
-        if not is_healthy:
-            pytest.skip("Database is not accessible")
-        return is_healthy
+        event_loop.run_until_complete(probe())
     except Exception as e:
         pytest.skip(f"Database health check failed: {e}")
+    return True
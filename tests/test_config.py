@@ -2,7 +2,7 @@
 Test configuration management.
 """
 
-from ai_wingman.config import settings, Settings
+from ai_wingman.config import settings, Settings, get_settings
 
 
 def test_settings_load():
@@ -11,6 +11,12 @@ def test_settings_load():
     assert isinstance(settings, Settings)
 
 
+def test_get_settings_is_cached():
+    """Test get_settings() returns the module singleton without re-parsing."""
+    assert get_settings() is settings
+    assert get_settings() is get_settings()
+
+
 def test_database_url_format():
     """Test database URL is correctly formatted."""
     url = settings.database_url
@@ -44,6 +50,11 @@ def test_top_k_results_validation():
     assert settings.top_k_results > 0
 
 
+def test_hnsw_ef_search_validation():
+    """Test hnsw_ef_search is in pgvector's accepted range."""
+    assert 1 <= settings.hnsw_ef_search <= 1000
+
+
 def test_app_env_values():
     """Test app_env has valid value."""
     valid_envs = ["development", "staging", "production"]
@@ -56,3 +67,10 @@ def test_ollama_configuration():
     assert settings.ollama_model
     assert 0.0 <= settings.ollama_temperature <= 2.0
     assert settings.ollama_max_tokens > 0
+
+
+def test_pool_configuration():
+    """Test connection pool configuration."""
+    assert settings.db_pool_size > 0
+    assert settings.db_max_overflow >= 0
+    assert isinstance(settings.db_disable_pool, bool)
@@ -5,16 +5,16 @@ Test database connection and health checks.
 import pytest
 
 
-@pytest.mark.asyncio
 @pytest.mark.requires_db
-async def test_database_health_check(db_health_check):
+async def test_database_health_check(db_health_check, test_schema):
     """Test database health check."""
-    assert db_health_check is True
+    from ai_wingman.database import db_manager
+
+    assert await db_manager.health_check() is True
 
 
-@pytest.mark.asyncio
 @pytest.mark.requires_db
-async def test_get_session(db_health_check):
+async def test_get_session(db_health_check, test_schema):
     """Test that we can get a database session."""
     from ai_wingman.database import db_manager
 
@@ -22,43 +22,30 @@ async def test_get_session(db_health_check):
         assert session is not None
 
 
-@pytest.mark.asyncio
 @pytest.mark.requires_db
 async def test_session_commit(db_session):
     """Test session commit works."""
     await db_session.commit()
 
 
-@pytest.mark.asyncio
 @pytest.mark.requires_db
 async def test_session_rollback(db_session):
     """Test session rollback works."""
     await db_session.rollback()
 
 
-@pytest.mark.asyncio
 @pytest.mark.requires_db
-async def test_database_schema_exists(db_session):
-    """Test that ai_wingman schema exists."""
-    from sqlalchemy import text
+async def test_committed_message_visible_to_new_session(
+    truncate_db, sample_message_data
+):
+    """Test committed rows are visible from a separate connection."""
+    from ai_wingman.database import db_manager, operations
 
-    result = await db_session.execute(
-        text(
-            "SELECT schema_name FROM information_schema.schemata WHERE schema_name = 'ai_wingman'"
-        )
-    )
-    schema = result.scalar_one_or_none()
-    assert schema == "ai_wingman"
+    message = await operations.create_slack_message(truncate_db, **sample_message_data)
+    await truncate_db.commit()
 
+    async with db_manager.get_session() as session:
+        found = await operations.get_slack_message_by_id(session, message.id)
 
-@pytest.mark.asyncio
-@pytest.mark.requires_db
-async def test_pgvector_extension_exists(db_session):
-    """Test that pgvector extension is installed."""
-    from sqlalchemy import text
-
-    result = await db_session.execute(
-        text("SELECT extname FROM pg_extension WHERE extname = 'vector'")
-    )
-    ext = result.scalar_one_or_none()
-    assert ext == "vector"
+    assert found is not None
+    assert found.message_text == sample_message_data["message_text"]
@@ -2,10 +2,15 @@
 Test database models and operations.
 """
 
+import numpy as np
+import orjson
 import pytest
-from uuid import UUID
+from datetime import datetime
+from sqlalchemy import event, text
+from sqlalchemy.exc import InvalidRequestError
+from uuid import UUID, uuid4
 from ai_wingman.database import operations
-from ai_wingman.database.models import SlackMessage, UserContext, ConversationThread
+from ai_wingman.database.models import Base, ConversationThread, SlackTimestamp
 
 
 # ============================================================================
@@ -13,7 +18,6 @@ from ai_wingman.database.models import SlackMessage, UserContext, ConversationTh
 # ============================================================================
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 @pytest.mark.requires_db
 async def test_create_slack_message(clean_db, sample_message_data):
@@ -27,7 +31,30 @@ async def test_create_slack_message(clean_db, sample_message_data):
     assert message.is_deleted is False
 
 
-@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_create_slack_message_single_round_trip(
+    clean_db, test_engine, sample_message_data
+):
+    """Test the INSERT returns server defaults without a follow-up SELECT."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        message = await operations.create_slack_message(clean_db, **sample_message_data)
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+    assert len(statements) == 1
+    assert "RETURNING" in statements[0]
+    # Populated by RETURNING, so reading them issues no query
+    assert message.created_at is not None
+    assert message.updated_at is not None
+
+
 @pytest.mark.integration
 @pytest.mark.requires_db
 async def test_create_message_with_embedding(
@@ -39,17 +66,52 @@ async def test_create_message_with_embedding(
     )
 
     assert message.embedding is not None
-    assert len(message.embedding) == 384
+    assert message.embedding.shape == (384,)
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_create_message_with_numpy_embedding(clean_db, sample_message_data):
+    """Test creating a message with a NumPy embedding."""
+    embedding = np.full(384, 0.1, dtype=np.float32)
+    message = await operations.create_slack_message(
+        clean_db, **sample_message_data, embedding=embedding
+    )
+
+    assert message.embedding is not None
+    assert message.embedding.shape == (384,)
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_create_slack_messages_batched(clean_db, sample_message_data):
+    """Test batched inserts return new IDs and skip existing messages."""
+    base = {k: v for k, v in sample_message_data.items() if k != "metadata"}
+    messages = [{**base, "slack_message_id": f"msg_{i}"} for i in range(5)]
+
+    ids = await operations.create_slack_messages_batched(
+        clean_db, messages, batch_size=2
+    )
+    await clean_db.flush()
+
+    assert len(ids) == 5
+    assert all(isinstance(message_id, UUID) for message_id in ids)
+
+    # Re-inserting is a no-op for existing slack_message_ids
+    messages.append({**base, "slack_message_id": "msg_new"})
+    ids = await operations.create_slack_messages_batched(clean_db, messages)
+    await clean_db.flush()
+
+    assert len(ids) == 1
+    assert await operations.get_message_count(clean_db) == 6
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 @pytest.mark.requires_db
 async def test_get_message_by_id(clean_db, sample_message_data):
     """Test retrieving message by internal ID."""
     # Create message
     created = await operations.create_slack_message(clean_db, **sample_message_data)
-    await clean_db.commit()
 
     # Retrieve by ID
     retrieved = await operations.get_slack_message_by_id(clean_db, created.id)
@@ -59,36 +121,46 @@ async def test_get_message_by_id(clean_db, sample_message_data):
     assert retrieved.message_text == sample_message_data["message_text"]
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 @pytest.mark.requires_db
 async def test_get_message_by_slack_id(clean_db, sample_message_data):
     """Test retrieving message by Slack ID."""
     # Create message
     await operations.create_slack_message(clean_db, **sample_message_data)
-    await clean_db.commit()
 
     # Retrieve by Slack ID
     retrieved = await operations.get_slack_message_by_slack_id(
-        clean_db, sample_message_data["slack_message_id"]
+        clean_db,
+        sample_message_data["slack_message_id"],
+        sample_message_data["channel_id"],
     )
 
     assert retrieved is not None
     assert retrieved.slack_message_id == sample_message_data["slack_message_id"]
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 @pytest.mark.requires_db
-async def test_get_messages_by_user(clean_db, sample_message_data):
+async def test_get_message_by_slack_id_per_channel(clean_db, sample_message_data):
+    """Test the same Slack ID in two channels resolves by channel."""
+    first = await operations.create_slack_message(clean_db, **sample_message_data)
+    second = await operations.create_slack_message(
+        clean_db, **{**sample_message_data, "channel_id": "C07654321"}
+    )
+
+    for message in (first, second):
+        retrieved = await operations.get_slack_message_by_slack_id(
+            clean_db, message.slack_message_id, message.channel_id
+        )
+        assert retrieved.id == message.id
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_get_messages_by_user(clean_db, sample_message_data, create_messages):
     """Test retrieving messages by user."""
     # Create multiple messages
-    for i in range(3):
-        data = sample_message_data.copy()
-        data["slack_message_id"] = f"msg_{i}"
-        data["slack_timestamp"] = 1234567890.0 + i
-        await operations.create_slack_message(clean_db, **data)
-    await clean_db.commit()
+    await create_messages(3)
 
     # Retrieve by user
     messages = await operations.get_messages_by_user(
@@ -99,18 +171,55 @@ async def test_get_messages_by_user(clean_db, sample_message_data):
     assert all(msg.user_id == sample_message_data["user_id"] for msg in messages)
 
 
-@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_get_messages_defers_embedding(
+    clean_db, sample_message_data, sample_embedding
+):
+    """Test list queries skip the embedding but report whether one exists."""
+    await operations.create_slack_message(
+        clean_db, **sample_message_data, embedding=sample_embedding
+    )
+    await clean_db.flush()
+    clean_db.expunge_all()
+
+    messages = await operations.get_messages_by_channel(
+        clean_db, sample_message_data["channel_id"]
+    )
+
+    assert messages[0].has_embedding is True
+    assert messages[0].to_dict()["has_embedding"] is True
+    with pytest.raises(InvalidRequestError):
+        messages[0].embedding
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_iter_messages_by_user(clean_db, sample_message_data, create_messages):
+    """Test streaming a user's messages newest first."""
+    await create_messages(3)
+
+    streamed = [
+        message.slack_message_id
+        async for message in operations.iter_messages_by_user(
+            clean_db, sample_message_data["user_id"]
+        )
+    ]
+
+    assert streamed == ["msg_2", "msg_1", "msg_0"]
+
+
 @pytest.mark.integration
 @pytest.mark.requires_db
 async def test_soft_delete_message(clean_db, sample_message_data):
     """Test soft deleting a message."""
     # Create message
     message = await operations.create_slack_message(clean_db, **sample_message_data)
-    await clean_db.commit()
+    await clean_db.flush()
 
     # Soft delete
     deleted = await operations.soft_delete_message(clean_db, message.id)
-    await clean_db.commit()
+    await clean_db.flush()
 
     assert deleted is True
 
@@ -119,17 +228,12 @@ async def test_soft_delete_message(clean_db, sample_message_data):
     assert retrieved.is_deleted is True
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 @pytest.mark.requires_db
-async def test_message_count(clean_db, sample_message_data):
+async def test_message_count(clean_db, sample_message_data, create_messages):
     """Test counting messages."""
     # Create messages
-    for i in range(5):
-        data = sample_message_data.copy()
-        data["slack_message_id"] = f"msg_{i}"
-        await operations.create_slack_message(clean_db, **data)
-    await clean_db.commit()
+    await create_messages(5)
 
     # Count all messages
     count = await operations.get_message_count(clean_db)
@@ -142,12 +246,340 @@ async def test_message_count(clean_db, sample_message_data):
     assert user_count == 5
 
 
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_message_count_estimate(clean_db, create_messages):
+    """Test unfiltered counts fall back to the planner estimate."""
+    await create_messages(5)
+    await clean_db.execute(text("ANALYZE ai_wingman.slack_messages"))
+
+    estimate = await operations.get_message_count(clean_db, include_deleted=True)
+    exact = await operations.get_message_count(
+        clean_db, include_deleted=True, exact=True
+    )
+    assert estimate == exact == 5
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_row_estimate_skips_empty_unanalyzed_partitions(clean_db):
+    """Test idle, never-analyzed partitions don't block the estimate."""
+    await clean_db.execute(
+        text("CREATE TABLE ai_wingman.estimate_probe (k int) PARTITION BY RANGE (k)")
+    )
+    for i in range(3):
+        await clean_db.execute(
+            text(
+                f"CREATE TABLE ai_wingman.estimate_probe_p{i} "
+                "PARTITION OF ai_wingman.estimate_probe "
+                f"FOR VALUES FROM ({i * 10}) TO ({i * 10 + 10})"
+            )
+        )
+    await clean_db.execute(
+        text(
+            "INSERT INTO ai_wingman.estimate_probe "
+            "SELECT g % 10 FROM generate_series(1, 50) g"
+        )
+    )
+    # Only the partition that has rows is analyzed; p1 and p2 stay at -1
+    await clean_db.execute(text("ANALYZE ai_wingman.estimate_probe_p0"))
+
+    async def estimate():
+        return await clean_db.scalar(
+            operations._ESTIMATED_ROWS, {"table": "ai_wingman.estimate_probe"}
+        )
+
+    assert await estimate() == 50
+
+    # A non-empty partition without statistics makes the estimate unknown
+    await clean_db.execute(text("INSERT INTO ai_wingman.estimate_probe VALUES (15)"))
+    assert await estimate() is None
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_message_counts(clean_db, create_messages):
+    """Test active and total counts from a single query."""
+    # Create messages
+    created = await create_messages(3)
+
+    # Soft delete one
+    await operations.soft_delete_message(clean_db, created[0])
+    await clean_db.flush()
+
+    active, total = await operations.get_message_counts(clean_db)
+    assert active == 2
+    assert total == 3
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_bulk_create_messages_copy_path(
+    clean_db, sample_message_data, sample_embedding
+):
+    """Test batches above COPY_THRESHOLD round-trip through COPY."""
+    base = {k: v for k, v in sample_message_data.items() if k != "metadata"}
+    messages = [
+        {
+            **base,
+            "slack_message_id": f"msg_{i}",
+            "message_text": f"line one\tcol\nline two \\ {i}",
+            "embedding": sample_embedding if i % 2 else None,
+            "metadata_": {"index": i},
+        }
+        for i in range(operations.COPY_THRESHOLD)
+    ]
+
+    created = await operations.bulk_create_messages(clean_db, messages)
+    await clean_db.flush()
+
+    assert created == operations.COPY_THRESHOLD
+    assert await operations.get_message_count(clean_db) == created
+
+    message = await operations.get_slack_message_by_slack_id(
+        clean_db, "msg_1", base["channel_id"]
+    )
+    assert message.message_text == "line one\tcol\nline two \\ 1"
+    assert message.metadata_ == {"index": 1}
+    assert message.embedding.dtype == np.float32
+    assert np.array_equal(message.embedding, sample_embedding.astype(np.float16))
+    assert message.is_deleted is False
+    assert isinstance(message.id, UUID)
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_bulk_create_messages_copy_mixed_keys(clean_db, sample_message_data):
+    """Test COPY batches whose rows set different fields."""
+    base = {
+        k: v
+        for k, v in sample_message_data.items()
+        if k not in ("metadata", "channel_name", "message_type")
+    }
+    messages = [
+        {**base, "slack_message_id": f"msg_{i}"}
+        for i in range(operations.COPY_THRESHOLD)
+    ]
+    messages[0]["channel_name"] = "general"
+    messages[1]["message_type"] = "bot_message"
+
+    created = await operations.bulk_create_messages(clean_db, messages)
+
+    assert created == operations.COPY_THRESHOLD
+    first, second, third = [
+        await operations.get_slack_message_by_slack_id(
+            clean_db, f"msg_{i}", base["channel_id"]
+        )
+        for i in range(3)
+    ]
+    assert first.channel_name == "general"
+    assert second.channel_name is None
+    assert second.message_type == "bot_message"
+    assert third.message_type == "message"
+    assert third.metadata_ == {}
+
+
+def test_configure_hnsw_params_scales_with_corpus():
+    """Test HNSW parameters grow with vector count."""
+    small = operations.configure_hnsw_params(1_000)
+    medium = operations.configure_hnsw_params(500_000)
+    large = operations.configure_hnsw_params(5_000_000)
+
+    assert small == {"m": 16, "ef_construction": 64, "ef_search": 40}
+    assert small["m"] < medium["m"] < large["m"]
+    assert small["ef_search"] < medium["ef_search"] < large["ef_search"]
+
+
+async def test_set_hnsw_ef_search_rejects_out_of_range():
+    """Test ef_search validation happens before touching the session."""
+    with pytest.raises(ValueError):
+        await operations.set_hnsw_ef_search(None, 0)
+
+
+@pytest.mark.parametrize(
+    "query_embedding",
+    [
+        [],
+        [True] * 384,
+        ["0.1"] * 384,
+        [0.1] * 383,
+        [float("nan")] + [0.1] * 383,
+        np.full((2, 384), 0.1),
+    ],
+    ids=["empty", "bool", "str", "short", "nan", "2d"],
+)
+async def test_search_rejects_invalid_embedding(query_embedding):
+    """Test embedding validation happens before touching the session."""
+    with pytest.raises(ValueError):
+        await operations.search_similar_messages(None, query_embedding)
+
+
+@pytest.mark.parametrize("ef_search", [0, -3, 1001])
+async def test_search_rejects_out_of_range_ef_search(ef_search):
+    """Test an explicit ef_search is validated, not clamped."""
+    with pytest.raises(ValueError):
+        await operations.search_similar_messages(
+            None, np.full(384, 0.1, dtype=np.float32), ef_search=ef_search
+        )
+
+
+def _embedding_at(similarity: float) -> np.ndarray:
+    """Unit vector whose cosine similarity to _QUERY is `similarity`."""
+    embedding = np.zeros(384, dtype=np.float32)
+    embedding[0] = similarity
+    embedding[1] = np.sqrt(1 - similarity**2)
+    return embedding
+
+
+_QUERY = _embedding_at(1.0)
+
+
+@pytest.fixture
+def create_embedded(clean_db, sample_message_data):
+    """Create a message with an embedding at a given similarity to _QUERY."""
+    base = {k: v for k, v in sample_message_data.items() if k != "slack_message_id"}
+
+    async def create(slack_message_id, similarity, **overrides):
+        return await operations.create_slack_message(
+            clean_db,
+            **{**base, **overrides},
+            slack_message_id=slack_message_id,
+            embedding=_embedding_at(similarity),
+        )
+
+    return create
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_nearest_neighbour_scan_uses_hnsw_index(
+    hnsw_index, clean_db, create_embedded
+):
+    """Test the ORDER BY distance LIMIT shape is served by the HNSW index."""
+    await create_embedded("exact", 1.0)
+    await clean_db.execute(text("SET LOCAL enable_seqscan = off"))
+
+    # Partitions carry their own copies of the index, attached to it
+    partition_indexes = set(
+        (
+            await clean_db.execute(
+                text(
+                    "SELECT inhrelid::regclass::text FROM pg_inherits "
+                    "WHERE inhparent = CAST(:index AS regclass)"
+                ),
+                {"index": f"ai_wingman.{hnsw_index.name}"},
+            )
+        ).scalars()
+    )
+    plan = "\n".join(
+        (
+            await clean_db.execute(
+                text(
+                    "EXPLAIN SELECT id FROM ai_wingman.slack_messages "
+                    "ORDER BY embedding <=> CAST(:vector AS halfvec) LIMIT 5"
+                ),
+                {"vector": _QUERY},
+            )
+        ).scalars()
+    )
+
+    assert "Index Scan" in plan
+    assert any(index.split(".")[-1] in plan for index in partition_indexes)
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_search_orders_nearest_first(clean_db, create_embedded):
+    """Test results come back nearest-first with their similarity."""
+    await create_embedded("far", 0.8)
+    await create_embedded("exact", 1.0)
+    await create_embedded("near", 0.9)
+
+    results = await operations.search_similar_messages(
+        clean_db, _QUERY, similarity_threshold=0.5
+    )
+
+    assert [m.slack_message_id for m, _ in results] == ["exact", "near", "far"]
+    assert [score for _, score in results] == pytest.approx([1.0, 0.9, 0.8], abs=1e-3)
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_search_applies_threshold_and_limit(clean_db, create_embedded):
+    """Test the threshold drops far rows and limit keeps the nearest."""
+    await create_embedded("exact", 1.0)
+    await create_embedded("near", 0.9)
+    await create_embedded("mid", 0.8)
+    await create_embedded("unrelated", 0.2)
+
+    above = await operations.search_similar_messages(
+        clean_db, _QUERY, similarity_threshold=0.85
+    )
+    nearest = await operations.search_similar_messages(
+        clean_db, _QUERY, similarity_threshold=0.5, limit=2
+    )
+
+    assert [m.slack_message_id for m, _ in above] == ["exact", "near"]
+    assert [m.slack_message_id for m, _ in nearest] == ["exact", "near"]
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_search_filters_by_user_and_channel(clean_db, create_embedded):
+    """Test user_id/channel_id restrict the candidates before ranking."""
+    await create_embedded("own", 0.9)
+    await create_embedded("other_user", 1.0, user_id="U07654321")
+    await create_embedded("other_channel", 1.0, channel_id="C07654321")
+
+    by_user = await operations.search_similar_messages(
+        clean_db, _QUERY, user_id="U07654321"
+    )
+    by_channel = await operations.search_similar_messages(
+        clean_db, _QUERY, channel_id="C07654321"
+    )
+    by_both = await operations.search_similar_messages(
+        clean_db, _QUERY, user_id="U01234567", channel_id="C01234567"
+    )
+
+    assert [m.slack_message_id for m, _ in by_user] == ["other_user"]
+    assert [m.slack_message_id for m, _ in by_channel] == ["other_channel"]
+    assert [m.slack_message_id for m, _ in by_both] == ["own"]
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+@pytest.mark.parametrize(
+    "ef_search,expected", [(None, [40, 100, 200]), (64, [64])], ids=["auto", "fixed"]
+)
+async def test_search_ef_search_schedule(
+    clean_db, create_embedded, monkeypatch, ef_search, expected
+):
+    """Test short results widen ef_search, while an explicit one runs once."""
+    await create_embedded("only", 1.0)
+
+    calls = []
+    set_ef_search = operations.set_hnsw_ef_search
+
+    async def record(session, ef):
+        calls.append(ef)
+        await set_ef_search(session, ef)
+
+    monkeypatch.setattr(operations, "set_hnsw_ef_search", record)
+    monkeypatch.setattr(operations.settings, "hnsw_ef_search", 40)
+
+    results = await operations.search_similar_messages(
+        clean_db, _QUERY, limit=5, ef_search=ef_search
+    )
+
+    assert len(results) == 1
+    assert calls == expected
+
+
 # ============================================================================
 # User Context Tests
 # ============================================================================
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 @pytest.mark.requires_db
 async def test_create_user_context(clean_db, sample_user_data):
@@ -160,24 +592,25 @@ async def test_create_user_context(clean_db, sample_user_data):
     assert context.total_messages == 0
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 @pytest.mark.requires_db
 async def test_get_or_create_user_context(clean_db, sample_user_data):
     """Test get_or_create pattern."""
     # First call creates
     context1 = await operations.get_or_create_user_context(clean_db, **sample_user_data)
-    await clean_db.commit()
+    assert context1.user_name == sample_user_data["user_name"]
+    assert context1.total_messages == 0
+    clean_db.expunge_all()
 
-    # Second call retrieves existing
+    # Second call retrieves existing, leaving it unchanged
     context2 = await operations.get_or_create_user_context(
-        clean_db, sample_user_data["user_id"]
+        clean_db, sample_user_data["user_id"], user_name="renamed"
     )
 
     assert context1.id == context2.id
+    assert context2.user_name == sample_user_data["user_name"]
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 @pytest.mark.requires_db
 async def test_update_user_context_stats(clean_db, sample_user_data):
@@ -185,13 +618,13 @@ async def test_update_user_context_stats(clean_db, sample_user_data):
     # Create context
     context = await operations.create_user_context(clean_db, **sample_user_data)
     assert context is not None
-    await clean_db.commit()
+    await clean_db.flush()
 
     # Update stats
     updated = await operations.update_user_context_stats(
         clean_db, sample_user_data["user_id"], increment_messages=5
     )
-    await clean_db.commit()
+    await clean_db.flush()
 
     assert updated.total_messages == 5
     assert updated.first_message_at is not None
@@ -203,7 +636,6 @@ async def test_update_user_context_stats(clean_db, sample_user_data):
 # ============================================================================
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 @pytest.mark.requires_db
 async def test_create_conversation_thread(clean_db, sample_thread_data):
@@ -216,7 +648,6 @@ async def test_create_conversation_thread(clean_db, sample_thread_data):
     assert thread.message_count == 0
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 @pytest.mark.requires_db
 async def test_update_thread_activity(clean_db, sample_thread_data):
@@ -224,49 +655,131 @@ async def test_update_thread_activity(clean_db, sample_thread_data):
     # Create thread
     thread = await operations.create_conversation_thread(clean_db, **sample_thread_data)
     assert thread is not None
-    await clean_db.commit()
+    await clean_db.flush()
 
     # Update activity
     updated = await operations.update_thread_activity(
         clean_db, sample_thread_data["thread_ts"], increment_messages=3
     )
-    await clean_db.commit()
+    await clean_db.flush()
 
     assert updated.message_count == 3
     assert updated.last_activity_at is not None
 
 
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_lookup_context_and_thread(
+    clean_db, sample_user_data, sample_thread_data
+):
+    """Test fetching a user context and thread in one query."""
+    user_id = sample_user_data["user_id"]
+    thread_ts = sample_thread_data["thread_ts"]
+
+    found = await operations.lookup_context_and_thread(clean_db, user_id, thread_ts)
+    assert found == (None, None)
+
+    await operations.create_conversation_thread(clean_db, **sample_thread_data)
+    context, thread = await operations.lookup_context_and_thread(
+        clean_db, user_id, thread_ts
+    )
+    assert context is None
+    assert thread.channel_id == sample_thread_data["channel_id"]
+
+    await operations.create_user_context(clean_db, **sample_user_data)
+    context, thread = await operations.lookup_context_and_thread(
+        clean_db, user_id, thread_ts
+    )
+    assert context.user_id == user_id
+    assert thread is not None
+
+
 # ============================================================================
 # Model Methods Tests
 # ============================================================================
 
 
-def test_slack_message_to_dict(sample_message_data):
-    """Test SlackMessage.to_dict() method."""
-    message = SlackMessage(**sample_message_data)
-    message_dict = message.to_dict()
+@pytest.mark.parametrize(
+    "instance_fixture,keys",
+    [
+        (
+            "slack_message_instance",
+            ["slack_message_id", "message_text", "has_embedding"],
+        ),
+        ("user_context_instance", ["user_id", "total_messages"]),
+        ("conversation_thread_instance", ["thread_ts", "message_count"]),
+    ],
+    ids=["slack_message", "user_context", "conversation_thread"],
+)
+def test_model_to_dict(request, instance_fixture, keys):
+    """Test Model.to_dict() method."""
+    instance_dict = request.getfixturevalue(instance_fixture).to_dict()
+
+    assert isinstance(instance_dict, dict)
+    for key in keys:
+        assert key in instance_dict
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+@pytest.mark.parametrize(
+    "create,data_fixture",
+    [
+        ("create_slack_message", "sample_message_data"),
+        ("create_user_context", "sample_user_data"),
+        ("create_conversation_thread", "sample_thread_data"),
+    ],
+    ids=["slack_message", "user_context", "conversation_thread"],
+)
+async def test_to_json_matches_to_dict(request, clean_db, create, data_fixture):
+    """Test to_json() encodes flushed and reloaded rows like to_dict()."""
+    create_model = getattr(operations, create)
+    instance = await create_model(clean_db, **request.getfixturevalue(data_fixture))
+    assert orjson.loads(instance.to_json()) == instance.to_dict()
+
+    # Reloaded rows carry the driver's own UUID subclass
+    clean_db.expunge_all()
+    loaded = await clean_db.get(type(instance), instance.id)
+    assert orjson.loads(loaded.to_json()) == loaded.to_dict()
+    assert loaded.to_dict()["id"] == str(instance.id)
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_default_id_is_plain_uuid7(clean_db, sample_message_data):
+    """Test generated ids are stdlib UUIDv7s that serialize as is."""
+    message = await operations.create_slack_message(clean_db, **sample_message_data)
+
+    assert type(message.id) is UUID
+    assert message.id.version == 7
+    assert orjson.dumps(message.id) == f'"{message.id}"'.encode()
+    assert orjson.loads(message.to_json())["id"] == str(message.id)
+
+
+def test_to_json_encodes_datetimes(sample_thread_data):
+    """Test to_json() writes datetimes in to_dict()'s ISO format."""
+    thread = ConversationThread(
+        id=uuid4(), started_at=datetime(2024, 1, 1, 12, 30), **sample_thread_data
+    )
 
-    assert isinstance(message_dict, dict)
-    assert "slack_message_id" in message_dict
-    assert "message_text" in message_dict
-    assert "has_embedding" in message_dict
+    assert orjson.loads(thread.to_json()) == thread.to_dict()
+    assert thread.to_dict()["started_at"] == "2024-01-01T12:30:00"
 
 
-def test_user_context_to_dict(sample_user_data):
-    """Test UserContext.to_dict() method."""
-    context = UserContext(**sample_user_data)
-    context_dict = context.to_dict()
+def test_base_as_dict_fast_reads_mapped_columns(sample_thread_data):
+    """Test the mapper-driven default covers every column by name."""
+    thread = ConversationThread(id=uuid4(), **sample_thread_data)
 
-    assert isinstance(context_dict, dict)
-    assert "user_id" in context_dict
-    assert "total_messages" in context_dict
+    assert Base._as_dict_fast(thread) == thread._as_dict_fast()
 
 
-def test_conversation_thread_to_dict(sample_thread_data):
-    """Test ConversationThread.to_dict() method."""
-    thread = ConversationThread(**sample_thread_data)
-    thread_dict = thread.to_dict()
+def test_slack_timestamp_microseconds():
+    """Test Slack timestamps are stored as integer microseconds."""
+    column_type = SlackTimestamp()
+    to_db = column_type.process_bind_param
+    from_db = column_type.process_result_value
 
-    assert isinstance(thread_dict, dict)
-    assert "thread_ts" in thread_dict
-    assert "message_count" in thread_dict
+    assert to_db(1234567890.123456, None) == 1234567890123456
+    assert to_db("1234567890.000001", None) == 1234567890000001
+    assert from_db(1234567890123456, None) == 1234567890.123456
+    assert to_db(None, None) is None